@@ -5,29 +5,521 @@ Ensure compliance with Facebook's Terms of Service and applicable laws.
 Use Facebook's official API for legitimate use cases.
 """
 
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext
 import threading
+import queue
 import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import re
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+import sys
+import subprocess
+import hashlib
+import functools
+import heapq
+import base64
+import argparse
+from itertools import islice
 import time
 import random
-from urllib.parse import urljoin, urlparse, parse_qs
+from urllib.parse import urljoin, urlparse, parse_qs, urlencode, urlunparse
+from collections import deque
 import webbrowser
 import datetime
 
+webdriver = By = Keys = WebDriverWait = EC = TimeoutException = Options = Service = ChromeDriverManager = None
+tk = ttk = filedialog = messagebox = scrolledtext = None
+ModernButton = AnimatedProgressBar = None
+
+def load_selenium():
+    # Selenium is imported only once a browser is needed, so download-only runs start without it
+    global webdriver, By, Keys, WebDriverWait, EC, TimeoutException, Options, Service, ChromeDriverManager
+    if webdriver is not None:
+        return
+    from selenium import webdriver as selenium_webdriver
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.common.keys import Keys
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+    from webdriver_manager.chrome import ChromeDriverManager
+    webdriver = selenium_webdriver
+
+class RunMetrics:
+    def __init__(self, live_path=None, live_interval=2.0, max_samples=10000):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.phases = {}
+        self.counters = {}
+        self.samples = {}
+        self.max_samples = max_samples
+        self.live_path = live_path
+        self.live_interval = live_interval
+        self.last_live_write = 0
+    
+    def add_phase(self, name, seconds):
+        with self.lock:
+            phase = self.phases.setdefault(name, {"count": 0, "seconds": 0.0})
+            phase["count"] += 1
+            phase["seconds"] += seconds
+        self.maybe_write_live()
+    
+    def count(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+        self.maybe_write_live()
+    
+    def observe(self, name, seconds):
+        with self.lock:
+            self.samples.setdefault(name, deque(maxlen=self.max_samples)).append(seconds)
+        self.maybe_write_live()
+    
+    def snapshot(self):
+        with self.lock:
+            latencies = {}
+            for name, values in self.samples.items():
+                ordered = sorted(values)
+                latencies[name] = {
+                    "count": len(ordered),
+                    "total_seconds": round(sum(ordered), 4),
+                    "p50_seconds": round(ordered[len(ordered) // 2], 4),
+                    "p90_seconds": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))], 4),
+                    "max_seconds": round(ordered[-1], 4)
+                }
+            return {
+                "elapsed_seconds": round(time.time() - self.started, 3),
+                "phases": {name: {"count": phase["count"], "seconds": round(phase["seconds"], 4)}
+                           for name, phase in self.phases.items()},
+                "counters": dict(self.counters),
+                "latencies": latencies
+            }
+    
+    def write_json(self, path, data):
+        temp_path = path + ".tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(temp_path, path)
+    
+    def maybe_write_live(self):
+        if not self.live_path or time.monotonic() - self.last_live_write < self.live_interval:
+            return
+        self.last_live_write = time.monotonic()
+        try:
+            self.write_json(self.live_path, self.snapshot())
+        except OSError:
+            pass
+
+class TimedDriver:
+    # Forwards to the WebDriver and records how long each call or property read takes
+    def __init__(self, driver, metrics):
+        self.__dict__["driver"] = driver
+        self.__dict__["metrics"] = metrics
+    
+    def __getattr__(self, name):
+        start = time.monotonic()
+        value = getattr(self.driver, name)
+        if not callable(value):
+            self.metrics.observe(f"webdriver.{name}", time.monotonic() - start)
+            return value
+        
+        def timed(*args, **kwargs):
+            call_start = time.monotonic()
+            try:
+                return value(*args, **kwargs)
+            finally:
+                self.metrics.observe(f"webdriver.{name}", time.monotonic() - call_start)
+        return timed
+    
+    def __setattr__(self, name, value):
+        setattr(self.driver, name, value)
+
+def timed_phase(method):
+    @functools.wraps(method)
+    def run(self, *args, **kwargs):
+        start = time.monotonic()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self.metrics.add_phase(method.__name__, time.monotonic() - start)
+    return run
+
+def instrumented_run(kind):
+    # Each album run starts fresh metrics and leaves a run_report.json in its folder
+    def decorator(method):
+        @functools.wraps(method)
+        def run(self, target, *args, **kwargs):
+            self.metrics = RunMetrics(self.metrics_file)
+            if isinstance(self.driver, TimedDriver):
+                self.driver.__dict__["metrics"] = self.metrics
+            self.report_folder = None
+            success = False
+            try:
+                success = method(self, target, *args, **kwargs)
+                return success
+            finally:
+                self.write_run_report(kind, target, success)
+        return run
+    return decorator
+
+class MediaUrlExpired(Exception):
+    pass
+
+class CollectedMediaIndex:
+    def __init__(self, media_urls=None):
+        self.items = []
+        self.media_url_set = set()
+        self.original_url_set = set()
+        # Seed entries are kept as-is, since file numbering depends on their positions
+        for media_url, media_type, original_url in media_urls or []:
+            self.items.append((media_url, media_type, original_url))
+            self.media_url_set.add(media_url)
+            self.original_url_set.add(original_url)
+    
+    def __len__(self):
+        return len(self.items)
+    
+    def has_original(self, original_url):
+        return original_url in self.original_url_set
+    
+    def is_new(self, media_url, original_url):
+        return media_url not in self.media_url_set and original_url not in self.original_url_set
+    
+    def add(self, media_url, media_type, original_url):
+        if not self.is_new(media_url, original_url):
+            return False
+        self.items.append((media_url, media_type, original_url))
+        self.media_url_set.add(media_url)
+        self.original_url_set.add(original_url)
+        return True
+
+class MediaUrlStream:
+    def __init__(self, scraper, file_path, chunk_size=64 * 1024):
+        self.scraper = scraper
+        self.file_path = os.path.normpath(file_path)
+        self.chunk_size = chunk_size
+        self.file_size = os.path.getsize(self.file_path) if os.path.exists(self.file_path) else 0
+        self.count = 0
+        self.chars_consumed = 0
+        self.total = None
+    
+    def __iter__(self):
+        self.count = 0
+        self.chars_consumed = 0
+        for entry in self.iter_snapshot():
+            self.count += 1
+            yield entry
+        for entry in self.scraper.iter_journal_entries(self.file_path, self.count):
+            self.count += 1
+            yield tuple(entry)
+        self.total = self.count
+    
+    def iter_snapshot(self):
+        if not os.path.exists(self.file_path):
+            return
+        decoder = json.JSONDecoder()
+        with open(self.file_path, 'r') as f:
+            buffer = f.read(self.chunk_size)
+            offset = 0
+            pos = 0
+            started = False
+            while True:
+                while pos < len(buffer) and buffer[pos] in ' \t\r\n' + (',' if started else ''):
+                    pos += 1
+                if pos >= len(buffer):
+                    offset += len(buffer)
+                    buffer = f.read(self.chunk_size)
+                    pos = 0
+                    if not buffer:
+                        return
+                    continue
+                if not started:
+                    if buffer[pos] != '[':
+                        raise ValueError(f"Expected a JSON array in {self.file_path}")
+                    started = True
+                    pos += 1
+                    continue
+                if buffer[pos] == ']':
+                    return
+                try:
+                    entry, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    # The entry straddles a chunk boundary, read more and retry
+                    more = f.read(self.chunk_size)
+                    if not more:
+                        raise
+                    offset += pos
+                    buffer = buffer[pos:] + more
+                    pos = 0
+                    continue
+                pos = end
+                self.chars_consumed = offset + pos
+                media_url, media_type, original_url = entry
+                yield media_url, media_type, original_url
+                if pos > self.chunk_size:
+                    offset += pos
+                    buffer = buffer[pos:]
+                    pos = 0
+    
+    def estimated_total(self):
+        if self.total is not None:
+            return self.total
+        if not self.chars_consumed:
+            return self.count
+        return max(self.count, round(self.file_size * self.count / self.chars_consumed))
+
+class MediaUrlFeed:
+    def __init__(self, scraper, expected_total, maxsize=64):
+        self.scraper = scraper
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.expected_total = expected_total
+        self.count = 0
+        self.total = None
+        self.consumer = None
+        self.consumer_lost = False
+    
+    def consumer_exited(self):
+        # A download pass that has returned or raised will never drain the queue again
+        return self.consumer is not None and self.consumer.done()
+    
+    def put(self, entry):
+        # Blocks while downloads are behind, but never past a stop request or the end of the download pass
+        while not self.scraper.stop_requested and not self.consumer_exited():
+            try:
+                self.queue.put(entry, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        if entry is not None and self.consumer_exited() and not self.consumer_lost:
+            self.consumer_lost = True
+            self.scraper.log("Downloads stopped before collection finished, still collecting links", "WARNING")
+        return False
+    
+    def close(self):
+        self.put(None)
+    
+    def __iter__(self):
+        while not self.scraper.stop_requested:
+            try:
+                entry = self.queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if entry is None:
+                self.total = self.count
+                return
+            self.count += 1
+            yield entry
+    
+    def estimated_total(self):
+        if self.total is not None:
+            return self.total
+        return max(self.count + self.queue.qsize(), self.expected_total)
+
+class DownloadLimiter:
+    def __init__(self, max_rps, max_concurrent):
+        self.max_rps = max_rps
+        self.slots = threading.BoundedSemaphore(max(1, int(max_concurrent)))
+        self.lock = threading.Lock()
+        self.next_request_time = 0.0
+    
+    def acquire(self, should_stop):
+        while not should_stop():
+            if self.slots.acquire(timeout=0.1):
+                return True
+        return False
+    
+    def release(self):
+        self.slots.release()
+    
+    def wait_for_turn(self, should_stop):
+        interval = 1.0 / self.max_rps if self.max_rps else 0
+        with self.lock:
+            now = time.monotonic()
+            start_at = max(now, self.next_request_time)
+            self.next_request_time = start_at + interval
+        while not should_stop():
+            remaining = start_at - time.monotonic()
+            if remaining <= 0:
+                return True
+            time.sleep(min(remaining, 0.1))
+        return False
+
+class BrowserLimit:
+    # Caps the Chrome instances of a whole batch, counting album browsers and grid resolvers alike
+    def __init__(self, max_browsers):
+        self.max_browsers = max_browsers
+        self.slots = threading.BoundedSemaphore(max_browsers)
+    
+    def acquire(self, should_stop):
+        while not should_stop():
+            if self.slots.acquire(timeout=0.5):
+                return True
+        return False
+    
+    def try_acquire(self):
+        return self.slots.acquire(blocking=False)
+    
+    def release(self):
+        self.slots.release()
+
+class SharedLogin:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.ready = threading.Event()
+        self.cookies = None
+        self.owner = None
+
+class NetworkMediaLog:
+    MEDIA_HOSTS = ('fbcdn', 'scontent', 'video-ak')
+    
+    def __init__(self, record_path=None, max_responses=1000):
+        self.responses = deque(maxlen=max_responses)
+        self.sequence = 0
+        self.navigation_mark = 0
+        self.record_path = record_path
+    
+    @classmethod
+    def replay(cls, log_path):
+        # Rebuild a log from entries recorded during an earlier run, for offline checks
+        network_log = cls()
+        with open(log_path, 'r') as f:
+            network_log.feed(json.loads(line) for line in f if line.strip())
+        return network_log
+    
+    def asset_name(self, url):
+        return os.path.basename(urlparse(url).path)
+    
+    def full_video_url(self, url):
+        # DASH segments carry byte ranges; dropping them asks the CDN for the whole file
+        parsed = urlparse(url)
+        query = [(k, v) for k, values in parse_qs(parsed.query).items() for v in values if k not in ('bytestart', 'byteend')]
+        return urlunparse(parsed._replace(query=urlencode(query)))
+    
+    def feed(self, entries):
+        recorder = open(self.record_path, 'a') if self.record_path else None
+        try:
+            for entry in entries:
+                if recorder:
+                    recorder.write(json.dumps(entry) + "\n")
+                try:
+                    message = json.loads(entry['message'])['message']
+                except (KeyError, TypeError, ValueError):
+                    continue
+                if message.get('method') != 'Network.responseReceived':
+                    continue
+                response = message.get('params', {}).get('response', {})
+                url = response.get('url', '')
+                mime_type = response.get('mimeType', '')
+                if not mime_type.startswith(('image/', 'video/')) or not any(host in url for host in self.MEDIA_HOSTS):
+                    continue
+                headers = {k.lower(): v for k, v in response.get('headers', {}).items()}
+                self.sequence += 1
+                self.responses.append({
+                    "url": url,
+                    "request_id": message.get('params', {}).get('requestId'),
+                    "media_type": 'video' if mime_type.startswith('video/') else 'image',
+                    "size": int(headers.get('content-length') or response.get('encodedDataLength') or 0),
+                    "asset": self.asset_name(url),
+                    "sequence": self.sequence
+                })
+        finally:
+            if recorder:
+                recorder.close()
+    
+    def find_response(self, url):
+        for response in reversed(self.responses):
+            if response["url"] == url:
+                return response
+        return None
+    
+    def mark_navigation(self):
+        self.navigation_mark = self.sequence
+    
+    def best_image_variant(self, src):
+        # The viewer loads several sizes of the same file; keep the largest one
+        asset = self.asset_name(src)
+        variants = [r for r in self.responses if r["media_type"] == 'image' and r["asset"] == asset]
+        if not variants:
+            return None
+        return max(variants, key=lambda r: r["size"])["url"]
+    
+    def current_video(self):
+        videos = [r for r in self.responses if r["media_type"] == 'video' and r["sequence"] > self.navigation_mark]
+        if not videos:
+            return None
+        return self.full_video_url(max(videos, key=lambda r: r["size"])["url"])
+
 class FacebookAlbumScraper:
-    def __init__(self, headless=False, progress_callback=None, log_callback=None, speed="Medium", combined_log_callback=None):
+    # One execute_script round trip per step instead of a find_element/get_attribute pair per selector
+    MEDIA_PROBE_SCRIPT = """
+        const permalink = window.location.href;
+        const mediaType = permalink.includes('/videos/') ? 'video' : 'image';
+        const candidates = mediaType === 'image'
+            ? [["img[data-visualcompletion='media-vc-image']", "img[src*='scontent']", "img[src*='fbcdn']"], ['scontent', 'fbcdn']]
+            : [["video[src*='fbcdn']", "video[data-sigil='inline-video']", "video[src*='video-ak']", "[data-video-id] video"], ['fbcdn', 'video-ak']];
+        let src = null;
+        for (const selector of candidates[0]) {
+            const element = document.querySelector(selector);
+            const value = element && (element.currentSrc || element.getAttribute('src'));
+            if (value && candidates[1].some(host => value.includes(host))) {
+                src = value;
+                break;
+            }
+        }
+        const hasMedia = document.querySelector(
+            "img[data-visualcompletion='media-vc-image'], video[src*='fbcdn'], video[data-sigil='inline-video'], video[src*='video-ak']") !== null;
+        return {mediaType: mediaType, src: src, permalink: permalink, hasMedia: hasMedia};
+    """
+    
+    FIRST_MEDIA_SCRIPT = """
+        const albumId = arguments[0];
+        const selectors = arguments[1];
+        for (const selector of selectors) {
+            for (const element of document.querySelectorAll(selector)) {
+                const rect = element.getBoundingClientRect();
+                if (rect.width === 0 || rect.height === 0 || getComputedStyle(element).visibility === 'hidden') {
+                    continue;
+                }
+                const width = parseInt(element.getAttribute('width') || element.width || element.naturalWidth || 100);
+                const height = parseInt(element.getAttribute('height') || element.height || element.naturalHeight || 100);
+                if (width < 100 || height < 100) {
+                    continue;
+                }
+                const link = element.closest('a');
+                const href = link ? link.href : '';
+                if (href && (href.includes(albumId) || href.includes('/videos/'))) {
+                    element.click();
+                    return href;
+                }
+            }
+        }
+        return null;
+    """
+    
+    GRID_LINKS_SCRIPT = """
+        const albumId = arguments[0];
+        const links = [];
+        const anchors = document.querySelectorAll("a[href*='/photo'], a[href*='/videos/']");
+        for (const link of anchors) {
+            const href = link.href;
+            if (href && (href.includes(albumId) || href.includes('/videos/')) && link.querySelector('img, video')) {
+                links.push(href);
+            }
+        }
+        window.scrollTo(0, document.body.scrollHeight);
+        return {links: links, anchorCount: anchors.length};
+    """
+    
+    GRID_COUNT_SCRIPT = "return document.querySelectorAll(\"a[href*='/photo'], a[href*='/videos/']\").length;"
+    
+    def __init__(self, headless=False, progress_callback=None, log_callback=None, speed="Medium", combined_log_callback=None,
+                 download_workers=4, max_rps=None, journal_fsync_every=20, journal_compact_every=250,
+                 verify_hashes=False, download_retries=3, download_limiter=None, shared_login=None, debug_port=9222,
+                 profile_dir=None, cookie_file=None, driver_path=None, driver_cache_file=None,
+                 navigation_timeout=5, capture_mode="dom", network_log_file=None, reuse_browser_bytes=False,
+                 collection_mode="viewer", resolver_workers=1, metrics_file=None, browser_limit=None):
         self.driver = None
         self.wait = None
         self.headless = headless
@@ -37,10 +529,53 @@ class FacebookAlbumScraper:
         self.stop_requested = False
         self.speed = speed
         self.delay_map = {
-            "Slow": {"grab": 1, "download": 0.5, "recheck": 0.5},
-            "Medium": {"grab": 0.6, "download": 0.3, "recheck": 0.3},
-            "Fast": {"grab": 0.2, "download": 0.1, "recheck": 0.2}
+            "Slow": {"grab": 1, "download": 0.5, "recheck": 0.5, "rps": 2},
+            "Medium": {"grab": 0.6, "download": 0.3, "recheck": 0.3, "rps": 5},
+            "Fast": {"grab": 0.2, "download": 0.1, "recheck": 0.2, "rps": 10}
         }
+        self.download_workers = max(1, int(download_workers))
+        self.max_rps = max_rps if max_rps else self.delay_map[self.speed]["rps"]
+        # Albums running in parallel share one limiter so the caps are global
+        self.download_limiter = download_limiter or DownloadLimiter(self.max_rps, self.download_workers)
+        self.shared_login = shared_login
+        self.debug_port = debug_port
+        self.profile_dir = profile_dir
+        self.cookie_file = cookie_file
+        self.run_started = None
+        self.first_media_reported = False
+        self.driver_path = driver_path or os.environ.get("FB_ALBUM_CHROMEDRIVER")
+        self.driver_cache_file = driver_cache_file or os.path.join(os.path.expanduser("~"), ".fb_album_scraper", "driver_cache.json")
+        self.startup_timings = {}
+        self.navigation_timeout = navigation_timeout
+        self.last_navigation_at = None
+        self.capture_mode = capture_mode
+        self.reuse_browser_bytes = reuse_browser_bytes
+        # Reading response bodies needs the request ids from the network log
+        self.network_log = NetworkMediaLog(network_log_file) if capture_mode == "network" or reuse_browser_bytes else None
+        # Full paths, so a scraper reused across albums never mistakes another album's file for this one's
+        self.browser_saved_files = set()
+        self.transfer_lock = threading.Lock()
+        self.bytes_downloaded = 0
+        self.bytes_reused = 0
+        self.step_latencies = []
+        self.recovery_steps = 0
+        self.collection_mode = collection_mode
+        self.resolver_workers = max(1, int(resolver_workers))
+        # A standalone scraper may run its own browser plus its extra resolvers
+        self.browser_limit = browser_limit or BrowserLimit(self.resolver_workers)
+        self.browser_slot_held = False
+        self.metrics_file = metrics_file
+        self.metrics = RunMetrics(metrics_file)
+        self.report_folder = None
+        self.session = None
+        self.session_lock = threading.Lock()
+        self.journal_fsync_every = journal_fsync_every
+        self.journal_compact_every = journal_compact_every
+        self.journal_handles = {}
+        self.journal_pending = {}
+        self.verify_hashes = verify_hashes
+        self.download_retries = download_retries
+        self.manifest_lock = threading.Lock()
         
     def log(self, message, level="INFO"):
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -54,7 +589,13 @@ class FacebookAlbumScraper:
         if self.progress_callback:
             self.progress_callback(current, total, message)
     
+    @timed_phase
     def setup_driver(self):
+        if not self.browser_slot_held:
+            if not self.browser_limit.acquire(lambda: self.stop_requested):
+                return
+            self.browser_slot_held = True
+        load_selenium()
         options = Options()
         if self.headless:
             options.add_argument('--headless')
@@ -63,22 +604,217 @@ class FacebookAlbumScraper:
         options.add_argument('--no-sandbox')
         options.add_argument('--disable-dev-shm-usage')
         options.add_argument('--disable-gpu')
-        options.add_argument('--remote-debugging-port=9222')
+        options.add_argument(f'--remote-debugging-port={self.debug_port}')
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option('useAutomationExtension', False)
         options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+        if self.profile_dir:
+            options.add_argument(f'--user-data-dir={os.path.abspath(self.profile_dir)}')
+        if self.network_log:
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
         
         try:
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=options)
+            resolve_start = time.monotonic()
+            service = Service(self.resolve_driver_path())
+            launch_start = time.monotonic()
+            self.driver = TimedDriver(webdriver.Chrome(service=service, options=options), self.metrics)
             self.wait = WebDriverWait(self.driver, 20)
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            self.log("Browser driver initialized successfully")
+            if self.reuse_browser_bytes:
+                # Keep enough response bodies buffered for full-size photos to be read back
+                self.driver.execute_cdp_cmd('Network.enable', {'maxTotalBufferSize': 200 * 1024 * 1024,
+                                                               'maxResourceBufferSize': 25 * 1024 * 1024})
+            self.startup_timings = {
+                "driver_resolution": launch_start - resolve_start,
+                "browser_launch": time.monotonic() - launch_start
+            }
+            self.log(f"Browser driver initialized successfully (driver resolution {self.startup_timings['driver_resolution']:.2f}s, "
+                     f"browser launch {self.startup_timings['browser_launch']:.2f}s)")
         except Exception as e:
             self.log(f"Failed to setup driver: {e}", "ERROR")
+            self.release_browser_slot()
             raise
 
+    def detect_chrome_version(self):
+        try:
+            if sys.platform.startswith('win'):
+                import winreg
+                for root in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+                    try:
+                        with winreg.OpenKey(root, r"Software\Google\Chrome\BLBeacon") as key:
+                            return winreg.QueryValueEx(key, "version")[0]
+                    except OSError:
+                        continue
+                return None
+            if sys.platform == 'darwin':
+                commands = [["/Applications/Google Chrome.app/Contents/MacOS/Google Chrome", "--version"]]
+            else:
+                commands = [[name, "--version"] for name in ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser")]
+            for command in commands:
+                try:
+                    output = subprocess.run(command, capture_output=True, text=True, timeout=10).stdout
+                except (OSError, subprocess.SubprocessError):
+                    continue
+                match = re.search(r'(\d+\.[\d.]+)', output)
+                if match:
+                    return match.group(1)
+        except Exception as e:
+            self.log(f"Could not detect Chrome version: {e}", "WARNING")
+        return None
+
+    def load_driver_cache(self):
+        try:
+            with open(self.driver_cache_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_driver_cache(self, cache):
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.driver_cache_file)), exist_ok=True)
+            with open(self.driver_cache_file, 'w') as f:
+                json.dump(cache, f)
+        except OSError as e:
+            self.log(f"Failed to save driver cache: {e}", "WARNING")
+
+    def resolve_driver_path(self):
+        if self.driver_path:
+            # Pinned driver: no version lookup and no network access
+            return self.driver_path
+        chrome_version = self.detect_chrome_version()
+        chrome_major = chrome_version.split('.')[0] if chrome_version else None
+        cache = self.load_driver_cache()
+        cached_path = cache.get("driver_path")
+        cached_usable = bool(cached_path) and os.path.exists(cached_path)
+        if cached_usable and (chrome_major is None or cache.get("chrome_major") == chrome_major):
+            return cached_path
+        
+        self.log(f"Resolving ChromeDriver for Chrome {chrome_version or 'unknown version'}...")
+        try:
+            driver_path = ChromeDriverManager().install()
+        except Exception as e:
+            if cached_usable:
+                self.log(f"ChromeDriver lookup failed ({e}), using cached driver {cached_path}", "WARNING")
+                return cached_path
+            raise
+        self.save_driver_cache({"driver_path": driver_path, "chrome_version": chrome_version, "chrome_major": chrome_major})
+        return driver_path
+
+    def is_login_page(self, url):
+        url = url.lower()
+        return 'login' in url or 'checkpoint' in url or 'two_step_verification' in url
+
+    def export_cookies(self):
+        return self.driver.get_cookies()
+
+    def import_cookies(self, cookies):
+        self.driver.get("https://www.facebook.com")
+        for cookie in cookies:
+            try:
+                self.driver.add_cookie(cookie)
+            except Exception as e:
+                self.log(f"Could not restore cookie {cookie.get('name')}: {e}", "WARNING")
+
+    def login_with_cookies(self, album_url, cookies):
+        self.import_cookies(cookies)
+        self.driver.get(album_url)
+        if self.is_login_page(self.driver.current_url):
+            self.log("Saved login session is no longer valid", "WARNING")
+            return False
+        self.log("Reused existing login session, proceeding to album...")
+        return True
+
+    def wait_for_shared_login(self, album_url, timeout=180):
+        # The first browser logs in interactively; the others reuse its cookies
+        shared = self.shared_login
+        start_time = time.time()
+        while time.time() - start_time < timeout:
+            if self.stop_requested:
+                return False
+            if shared.ready.is_set():
+                if self.login_with_cookies(album_url, shared.cookies):
+                    return True
+                shared.ready.clear()
+            with shared.lock:
+                is_owner = shared.owner is None or shared.owner is self
+                if is_owner:
+                    shared.owner = self
+            if is_owner:
+                logged_in = self.wait_for_own_login(album_url, timeout - (time.time() - start_time))
+                with shared.lock:
+                    if logged_in:
+                        shared.cookies = self.export_cookies()
+                        shared.ready.set()
+                    shared.owner = None
+                return logged_in
+            self.log("Waiting for login in another browser window...")
+            shared.ready.wait(1)
+        self.log("Login timeout while waiting for shared session.", "ERROR")
+        return False
+
+    def load_saved_cookies(self):
+        if not self.cookie_file or not os.path.exists(self.cookie_file):
+            return None
+        try:
+            with open(self.cookie_file, 'r') as f:
+                cookies = json.load(f)
+        except (OSError, ValueError) as e:
+            self.log(f"Could not read saved login cookies: {e}", "WARNING")
+            return None
+        # c_user identifies the logged-in account; without a live one the session is gone
+        now = time.time()
+        for cookie in cookies:
+            if cookie.get('name') == 'c_user' and cookie.get('expiry', now + 1) > now:
+                return cookies
+        return None
+
+    def save_login_cookies(self):
+        if not self.cookie_file:
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.cookie_file)), exist_ok=True)
+            temp_path = self.cookie_file + ".tmp"
+            # Session cookies are as good as a password, so only the owner may read them; a stale temp file
+            # would keep its old mode, so it is removed first
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            with os.fdopen(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as f:
+                json.dump(self.export_cookies(), f)
+            os.replace(temp_path, self.cookie_file)
+            self.log("Saved login session for future runs")
+        except Exception as e:
+            self.log(f"Failed to save login cookies: {e}", "WARNING")
+
+    def discard_saved_login(self):
+        if self.cookie_file and os.path.exists(self.cookie_file):
+            os.remove(self.cookie_file)
+
+    def restore_saved_login(self, album_url):
+        if not self.profile_dir and not self.cookie_file:
+            return False
+        cookies = self.load_saved_cookies()
+        if cookies:
+            if self.login_with_cookies(album_url, cookies):
+                return True
+            self.discard_saved_login()
+        elif self.profile_dir:
+            # The browser profile may still hold a session even without a cookie file
+            self.driver.get(album_url)
+            if not self.is_login_page(self.driver.current_url):
+                self.log("Reused browser profile session, proceeding to album...")
+                return True
+        return False
+
+    @timed_phase
     def wait_for_login(self, album_url, timeout=180):
+        if self.shared_login:
+            return self.wait_for_shared_login(album_url, timeout)
+        return self.wait_for_own_login(album_url, timeout)
+
+    def wait_for_own_login(self, album_url, timeout=180):
+        # Not timed itself: it always runs inside wait_for_login, which records the whole wait once
+        if self.restore_saved_login(album_url):
+            return True
         self.log("Please log in to Facebook in the browser window. Complete any additional verification if required...")
         self.driver.get("https://www.facebook.com/login")
         
@@ -95,6 +831,7 @@ class FacebookAlbumScraper:
                 current_url = self.driver.current_url.lower()
                 if 'login' not in current_url and 'checkpoint' not in current_url and 'two_step_verification' not in current_url:
                     self.log("Full login confirmed, proceeding to album...")
+                    self.save_login_cookies()
                     return True
                 else:
                     self.log("Additional verification required, please complete it...")
@@ -113,31 +850,128 @@ class FacebookAlbumScraper:
         folder_path = os.path.normpath(os.path.join(main_folder, album_title))
         if not os.path.exists(folder_path):
             os.makedirs(folder_path)
+        self.report_folder = folder_path
         return folder_path
 
+    def get_journal_path(self, file_path):
+        return os.path.splitext(os.path.normpath(file_path))[0] + ".journal.jsonl"
+
+    def get_resume_marker_path(self, file_path):
+        return os.path.splitext(os.path.normpath(file_path))[0] + ".resume.json"
+
+    def load_resume_url(self, file_path, media_urls):
+        # After a sync the file ends with the album's newest items, so the walk continues from the tail recorded before it
+        try:
+            with open(self.get_resume_marker_path(file_path), 'r') as f:
+                return json.load(f)["resume_url"]
+        except (OSError, ValueError, KeyError):
+            return media_urls[-1][2]
+
+    def save_resume_url(self, file_path, resume_url):
+        marker_path = self.get_resume_marker_path(file_path)
+        # Repeated syncs keep the oldest tail, which is where the unwalked part of the album starts
+        if os.path.exists(marker_path):
+            return
+        with open(marker_path, 'w') as f:
+            json.dump({"resume_url": resume_url}, f)
+
+    def clear_resume_url(self, file_path):
+        marker_path = self.get_resume_marker_path(file_path)
+        if os.path.exists(marker_path):
+            os.remove(marker_path)
+
+    def close_journal(self, journal_path):
+        handle = self.journal_handles.pop(journal_path, None)
+        if handle:
+            handle.close()
+        self.journal_pending.pop(journal_path, None)
+
     def save_urls_to_file(self, urls, file_path):
         try:
             file_path = os.path.normpath(file_path)
             os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            with open(file_path, 'w') as f:
+            temp_path = file_path + ".tmp"
+            with open(temp_path, 'w') as f:
                 json.dump(urls, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, file_path)
+            # The snapshot now holds every journaled entry, so the journal can start over
+            journal_path = self.get_journal_path(file_path)
+            self.close_journal(journal_path)
+            if os.path.exists(journal_path):
+                os.remove(journal_path)
             self.log(f"Saved {len(urls)} URLs to {file_path}")
         except Exception as e:
             self.log(f"Failed to save URLs to file: {e}", "ERROR")
 
+    def append_url_to_journal(self, urls, file_path):
+        try:
+            journal_path = self.get_journal_path(file_path)
+            handle = self.journal_handles.get(journal_path)
+            if handle is None:
+                os.makedirs(os.path.dirname(journal_path), exist_ok=True)
+                handle = open(journal_path, 'a')
+                self.journal_handles[journal_path] = handle
+            handle.write(json.dumps([len(urls) - 1] + list(urls[-1])) + "\n")
+            handle.flush()
+            pending = self.journal_pending.get(journal_path, 0) + 1
+            self.journal_pending[journal_path] = pending
+            if self.journal_fsync_every and pending % self.journal_fsync_every == 0:
+                os.fsync(handle.fileno())
+            if self.journal_compact_every and pending >= self.journal_compact_every:
+                self.save_urls_to_file(urls, file_path)
+        except Exception as e:
+            self.log(f"Failed to append URL to journal: {e}", "ERROR")
+
+    def iter_journal_entries(self, file_path, start_index):
+        journal_path = self.get_journal_path(file_path)
+        if not os.path.exists(journal_path):
+            return
+        next_index = start_index
+        with open(journal_path, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A torn final line from an interrupted write
+                    self.log(f"Ignoring incomplete journal record in {journal_path}", "WARNING")
+                    return
+                index, entry = record[0], record[1:]
+                if index < next_index:
+                    continue
+                if index > next_index:
+                    self.log(f"Journal gap at entry {next_index + 1} in {journal_path}, ignoring the rest", "WARNING")
+                    return
+                next_index += 1
+                yield entry
+
+    def replay_journal(self, urls, file_path):
+        replayed = 0
+        for entry in self.iter_journal_entries(file_path, len(urls)):
+            urls.append(entry)
+            replayed += 1
+        return replayed
+
     def load_urls_from_file(self, file_path):
         try:
             file_path = os.path.normpath(file_path)
+            urls = []
             if os.path.exists(file_path):
                 with open(file_path, 'r') as f:
                     urls = json.load(f)
-                self.log(f"Loaded {len(urls)} URLs from {file_path}")
-                return urls
-            return []
+            replayed = self.replay_journal(urls, file_path)
+            if urls:
+                if replayed:
+                    self.log(f"Loaded {len(urls)} URLs from {file_path} ({replayed} replayed from journal)")
+                else:
+                    self.log(f"Loaded {len(urls)} URLs from {file_path}")
+            return urls
         except Exception as e:
             self.log(f"Failed to load URLs from file: {e}", "ERROR")
             return []
 
+    @timed_phase
     def select_first_media(self, album_url):
         try:
             album_id = parse_qs(urlparse(album_url).query).get('set', [''])[0]
@@ -150,28 +984,17 @@ class FacebookAlbumScraper:
                 "img[src*='fbcdn']",
                 "video[src*='fbcdn']"
             ]
-            for selector in selectors:
-                try:
-                    media_elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    for element in media_elements:
-                        if element.is_displayed():
-                            width = element.get_attribute('width') or element.get_attribute('naturalWidth') or '100'
-                            height = element.get_attribute('height') or element.get_attribute('naturalHeight') or '100'
-                            if int(width) >= 100 and int(height) >= 100:
-                                href = element.find_element(By.XPATH, "./ancestor::a").get_attribute('href') if element.find_elements(By.XPATH, "./ancestor::a") else ''
-                                if href and (album_id in href or '/videos/' in href):
-                                    self.driver.execute_script("arguments[0].click();", element)
-                                    self.log("Selected first media (image or video)")
-                                    time.sleep(self.delay_map[self.speed]["grab"])
-                                    return True
-                except:
-                    continue
+            if self.driver.execute_script(self.FIRST_MEDIA_SCRIPT, album_id, selectors):
+                self.log("Selected first media (image or video)")
+                time.sleep(self.delay_map[self.speed]["grab"])
+                return True
             self.log("Could not find first media", "ERROR")
             return False
         except Exception as e:
             self.log(f"Error selecting first media: {e}", "ERROR")
             return False
 
+    @timed_phase
     def get_album_title(self):
         title_selectors = [
             "h1",
@@ -196,6 +1019,7 @@ class FacebookAlbumScraper:
         self.log(f"Could not find album title, using: {fallback_title}", "WARNING")
         return fallback_title
 
+    @timed_phase
     def get_media_count(self):
         try:
             scripts = self.driver.find_elements(By.TAG_NAME, 'script')
@@ -213,51 +1037,90 @@ class FacebookAlbumScraper:
             self.log(f"Error detecting media count: {e}, using default: 5000", "WARNING")
             return 5000
 
-    def get_media_url(self):
+    def probe_media(self):
+        return self.driver.execute_script(self.MEDIA_PROBE_SCRIPT)
+
+    def navigate_next(self, min_interval):
+        # The speed profile is a minimum interval between navigations, not a sleep after each one
+        if self.last_navigation_at:
+            remaining = self.last_navigation_at + min_interval - time.monotonic()
+            if remaining > 0:
+                time.sleep(remaining)
+                self.metrics.add_phase("grab_wait", remaining)
+        self.last_navigation_at = time.monotonic()
+        if self.network_log:
+            self.network_log.feed(self.driver.get_log('performance'))
+            self.network_log.mark_navigation()
+        self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.RIGHT)
+
+    @timed_phase
+    def wait_for_media_change(self, previous_probe):
+        # Finish the step as soon as the viewer shows the next item, up to navigation_timeout
+        started = time.monotonic()
+        latest = {}
+        
+        def media_changed(driver):
+            latest["probe"] = self.probe_media()
+            probe = latest["probe"]
+            if probe["permalink"] == previous_probe["permalink"]:
+                return False
+            return probe["mediaType"] == 'video' or (probe["src"] and probe["src"] != previous_probe["src"])
+        
         try:
-            current_url = self.driver.current_url
-            media_type = 'video' if '/videos/' in current_url else 'image'
+            WebDriverWait(self.driver, self.navigation_timeout, poll_frequency=0.05).until(media_changed)
+        except TimeoutException:
+            pass
+        self.step_latencies.append(time.monotonic() - started)
+        return latest.get("probe") or self.probe_media()
+
+    def log_step_latencies(self, fixed_delay):
+        if not self.step_latencies:
+            return
+        latencies = sorted(self.step_latencies)
+        percentile = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))]
+        self.log(f"Step latency over {len(latencies)} steps: p50 {percentile(0.5):.2f}s, p90 {percentile(0.9):.2f}s, "
+                 f"max {latencies[-1]:.2f}s (fixed delay was {fixed_delay:.2f}s)")
+        self.step_latencies = []
+
+    def get_network_media_url(self, probe):
+        try:
+            self.network_log.feed(self.driver.get_log('performance'))
+        except Exception as e:
+            self.log(f"Could not read browser network log: {e}", "WARNING")
+        if probe["mediaType"] == 'video':
+            return self.network_log.current_video()
+        if probe["src"] and not probe["src"].startswith('blob:'):
+            return self.network_log.best_image_variant(probe["src"])
+        return None
+
+    @timed_phase
+    def get_media_url(self, probe=None):
+        try:
+            probe = probe or self.probe_media()
+            current_url = probe["permalink"]
+            media_type = probe["mediaType"]
+            
+            # With only browser-byte reuse on, the log just supplies request ids and never picks the URL
+            if self.capture_mode == "network":
+                network_url = self.get_network_media_url(probe)
+                if network_url:
+                    self.log(f"Found {media_type} URL in network log: {network_url}")
+                    return network_url, media_type, current_url
             
-            if media_type == 'image':
+            if probe["src"]:
+                self.log(f"Found {media_type} URL: {probe['src']}")
+                return probe["src"], media_type, current_url
+            
+            if media_type == 'video':
                 try:
-                    image_selectors = [
-                        "img[data-visualcompletion='media-vc-image']",
-                        "img[src*='scontent']",
-                        "img[src*='fbcdn']"
-                    ]
-                    for selector in image_selectors:
-                        image = self.driver.find_element(By.CSS_SELECTOR, selector)
-                        image_url = image.get_attribute('src')
-                        if image_url and ('scontent' in image_url or 'fbcdn' in image_url):
-                            self.log(f"Found image URL: {image_url}")
-                            return image_url, media_type, current_url
+                    self.driver.execute_script("document.querySelector('video').play();")
+                    time.sleep(self.delay_map[self.speed]["grab"])
+                    video_url = self.driver.execute_script("const video = document.querySelector('video'); return video && (video.currentSrc || video.getAttribute('src'));")
+                    if video_url:
+                        self.log(f"Found video URL after playback attempt: {video_url}")
+                        return video_url, media_type, current_url
                 except:
                     pass
-            else:
-                try:
-                    video_selectors = [
-                        "video[src*='fbcdn']",
-                        "video[data-sigil='inline-video']",
-                        "video[src*='video-ak']",
-                        "[data-video-id] video"
-                    ]
-                    for selector in video_selectors:
-                        video = self.driver.find_element(By.CSS_SELECTOR, selector)
-                        video_url = video.get_attribute('src')
-                        if video_url and ('fbcdn' in video_url or 'video-ak' in video_url):
-                            self.log(f"Found video URL: {video_url}")
-                            return video_url, media_type, current_url
-                except:
-                    try:
-                        self.driver.execute_script("document.querySelector('video').play();")
-                        time.sleep(self.delay_map[self.speed]["grab"])
-                        video = self.driver.find_element(By.CSS_SELECTOR, "video")
-                        video_url = video.get_attribute('src')
-                        if video_url:
-                            self.log(f"Found video URL after playback attempt: {video_url}")
-                            return video_url, media_type, current_url
-                    except:
-                        pass
             
             self.log(f"Invalid or missing media URL for {current_url}", "ERROR")
             return None, None, None
@@ -265,6 +1128,7 @@ class FacebookAlbumScraper:
             self.log(f"Failed to get media URL for {self.driver.current_url}: {e}", "ERROR")
             return None, None, None
 
+    @timed_phase
     def navigate_to_media(self, target_url):
         try:
             self.driver.get(target_url)
@@ -278,14 +1142,42 @@ class FacebookAlbumScraper:
             self.log(f"Failed to navigate to media URL: {e}", "ERROR")
             return False
 
-    def collect_media_urls(self, album_url, max_media=5000, url_file_path=None, resume_url=None):
-        media_urls = self.load_urls_from_file(url_file_path) if url_file_path else []
+    @timed_phase
+    def seek_to_last_known(self, media_urls, album_url, last_visited=None, checkpoint_every=100, max_candidates=4):
+        # Jump back to where collection left off instead of replaying the album from its first item
+        candidates = [last_visited] + [media_urls[i][2] for i in range(len(media_urls) - 1, -1, -checkpoint_every)]
+        steps = 0
+        for permalink in [c for c in dict.fromkeys(candidates) if c][:max_candidates]:
+            steps += 1
+            if self.navigate_to_media(permalink):
+                self.recovery_steps += steps
+                self.log(f"Recovered position in {steps} steps instead of replaying {len(media_urls)} items")
+                return True
+        steps += 1
+        self.recovery_steps += steps
+        if self.select_first_media(album_url):
+            self.log(f"No known permalink could be reopened, restarted from the first media after {steps} steps", "WARNING")
+            return True
+        return False
+
+    @timed_phase
+    def collect_media_urls(self, album_url, max_media=5000, url_file_path=None, resume_url=None, media_feed=None,
+                           browser_save_folder=None):
+        if self.collection_mode == "grid" and not resume_url:
+            return self.collect_media_urls_from_grid(album_url, max_media, url_file_path, media_feed)
+        media_index = CollectedMediaIndex(self.load_urls_from_file(url_file_path) if url_file_path else [])
+        media_urls = media_index.items
+        if media_feed:
+            for entry in media_urls:
+                media_feed.put(entry)
         current_media = len(media_urls)
         album_id = parse_qs(urlparse(album_url).query).get('set', [''])[0]
         max_stuck_attempts = 5
         stuck_count = 0
         last_url_count = len(media_urls)
         max_recheck_attempts = 3
+        last_visited = None
+        self.recovery_steps = 0
         
         self.log(f"Collecting up to {max_media} media URLs (images and videos)...")
         self.update_progress(current_media, max_media, "Collecting media URLs...")
@@ -303,32 +1195,41 @@ class FacebookAlbumScraper:
                 self.save_urls_to_file(media_urls, url_file_path)
             return media_urls
         
+        # The probe taken after each navigation doubles as the next step's media lookup
+        probe = None
         while current_media < max_media and not self.stop_requested:
             try:
-                media_url, media_type, original_url = self.get_media_url()
-                if media_url and media_url not in [url for url, _, _ in media_urls] and original_url not in [o_url for _, _, o_url in media_urls]:
-                    media_urls.append((media_url, media_type, original_url))
+                probe = probe or self.probe_media()
+                media_url, media_type, original_url = self.get_media_url(probe)
+                previous_probe = probe
+                probe = None
+                last_visited = original_url or last_visited
+                if media_url and media_index.add(media_url, media_type, original_url):
                     self.log(f"Collected {media_type} URL {len(media_urls)}/{max_media}: {media_url}")
+                    if self.run_started and not self.first_media_reported:
+                        self.first_media_reported = True
+                        self.log(f"Time to first media URL: {time.monotonic() - self.run_started:.1f}s")
                     self.update_progress(len(media_urls), max_media, f"Collected {len(media_urls)} URLs")
                     if url_file_path:
-                        self.save_urls_to_file(media_urls, url_file_path)
+                        self.append_url_to_journal(media_urls, url_file_path)
+                    if browser_save_folder:
+                        self.save_from_browser(len(media_urls), media_url, media_type, browser_save_folder)
+                    if media_feed:
+                        media_feed.put(media_urls[-1])
                     stuck_count = 0
                 else:
-                    if media_url and original_url in [o_url for _, _, o_url in media_urls]:
+                    if media_url and media_index.has_original(original_url):
                         self.log(f"Skipped duplicate media URL: {original_url}", "INFO")
                     stuck_count += 1
                 
                 if stuck_count >= max_stuck_attempts:
+                    self.metrics.count("collection.stuck_events")
                     self.log(f"Stuck at {len(media_urls)} URLs, reloading page...", "WARNING")
                     self.driver.refresh()
                     time.sleep(self.delay_map[self.speed]["grab"])
                     stuck_count = 0
-                    if resume_url and not self.navigate_to_media(resume_url):
-                        if not self.select_first_media(album_url):
-                            self.log("Failed to reselect first media after reload", "ERROR")
-                            break
-                    elif not self.select_first_media(album_url):
-                        self.log("Failed to reselect first media after reload", "ERROR")
+                    if not self.seek_to_last_known(media_urls, album_url, last_visited or resume_url):
+                        self.log("Failed to recover position after reload", "ERROR")
                         break
                 
                 if len(media_urls) == last_url_count:
@@ -337,24 +1238,26 @@ class FacebookAlbumScraper:
                     last_url_count = len(media_urls)
                 
                 try:
-                    self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.RIGHT)
-                    time.sleep(self.delay_map[self.speed]["grab"])
-                    
-                    media_elements = self.driver.find_elements(By.CSS_SELECTOR, "img[data-visualcompletion='media-vc-image'], video[src*='fbcdn'], video[data-sigil='inline-video'], video[src*='video-ak']")
-                    if not media_elements:
+                    self.navigate_next(self.delay_map[self.speed]["grab"])
+                    probe = self.wait_for_media_change(previous_probe)
+                    if not probe["hasMedia"]:
                         self.log("No media elements found, attempting to detect end of album...", "WARNING")
                         time.sleep(self.delay_map[self.speed]["grab"])
-                        if not self.driver.find_elements(By.CSS_SELECTOR, "img[data-visualcompletion='media-vc-image'], video[src*='fbcdn'], video[data-sigil='inline-video'], video[src*='video-ak']"):
+                        probe = self.probe_media()
+                        if not probe["hasMedia"]:
                             self.log("Reached end of album", "INFO")
                             break
                 except:
                     self.log("Failed to navigate to next media, retrying...", "WARNING")
+                    probe = None
                     stuck_count += 1
                 
                 current_media += 1
                 
             except Exception as e:
+                self.metrics.count("collection.errors")
                 self.log(f"Error during URL collection: {e}", "WARNING")
+                probe = None
                 stuck_count += 1
                 if stuck_count >= max_stuck_attempts:
                     self.log("Too many errors, stopping URL collection", "ERROR")
@@ -364,39 +1267,69 @@ class FacebookAlbumScraper:
         
         # Fallback recheck if collected URLs are less than max_media
         if len(media_urls) < max_media and not self.stop_requested:
-            self.log(f"Collected {len(media_urls)} URLs, less than expected {max_media}. Initiating fast rewind check...", "WARNING")
+            self.log(f"Collected {len(media_urls)} URLs, {max_media - len(media_urls)} short of the album count. Checking for the missing items...", "WARNING")
             for attempt in range(max_recheck_attempts):
-                self.log(f"Fast rewind check attempt {attempt + 1}/{max_recheck_attempts}...")
+                self.log(f"Recheck attempt {attempt + 1}/{max_recheck_attempts}...")
                 try:
-                    # Rewind to first media
-                    if not self.select_first_media(album_url):
-                        self.log("Failed to reselect first media for recheck", "ERROR")
+                    # The first pass continues past the last known item; later passes rewind in case the gap is earlier
+                    if attempt == 0 and media_urls:
+                        positioned = self.seek_to_last_known(media_urls, album_url)
+                    else:
+                        positioned = self.select_first_media(album_url)
+                    if not positioned:
+                        self.log("Failed to position the viewer for recheck", "ERROR")
                         break
                     
                     previous_count = len(media_urls)
                     fast_delay = self.delay_map[self.speed]["grab"] * 0.5  # Faster delay for recheck
+                    recheck_steps = 0
+                    # The album count may be unreachable (deleted items or the default count), so each pass is bounded:
+                    # by a step budget, by the walk wrapping back to a permalink it already visited, and, past the
+                    # last known item, by a run of duplicates
+                    max_steps = (0 if attempt == 0 else previous_count) + (max_media - previous_count) + max_stuck_attempts
+                    visited = set()
+                    duplicate_streak = 0
                     
-                    while current_media < max_media and not self.stop_requested:
+                    probe = None
+                    # Stop as soon as the gap implied by the album count is filled
+                    while len(media_urls) < max_media and recheck_steps < max_steps and not self.stop_requested:
                         try:
-                            media_url, media_type, original_url = self.get_media_url()
-                            if media_url and media_url not in [url for url, _, _ in media_urls] and original_url not in [o_url for _, _, o_url in media_urls]:
-                                media_urls.append((media_url, media_type, original_url))
+                            probe = probe or self.probe_media()
+                            media_url, media_type, original_url = self.get_media_url(probe)
+                            previous_probe = probe
+                            probe = None
+                            recheck_steps += 1
+                            last_visited = original_url or last_visited
+                            if original_url in visited:
+                                self.log("Recheck walked back to an item it already visited, ending this pass", "INFO")
+                                break
+                            if original_url:
+                                visited.add(original_url)
+                            if media_url and media_index.add(media_url, media_type, original_url):
+                                duplicate_streak = 0
                                 self.log(f"Recheck collected {media_type} URL {len(media_urls)}/{max_media}: {media_url}")
                                 self.update_progress(len(media_urls), max_media, f"Recheck collected {len(media_urls)} URLs")
                                 if url_file_path:
-                                    self.save_urls_to_file(media_urls, url_file_path)
+                                    self.append_url_to_journal(media_urls, url_file_path)
+                                if browser_save_folder:
+                                    self.save_from_browser(len(media_urls), media_url, media_type, browser_save_folder)
+                                if media_feed:
+                                    media_feed.put(media_urls[-1])
                             else:
-                                if media_url and original_url in [o_url for _, _, o_url in media_urls]:
+                                if media_url and media_index.has_original(original_url):
                                     self.log(f"Skipped duplicate media URL: {original_url}", "INFO")
+                                duplicate_streak += 1
+                                if attempt == 0 and duplicate_streak > max_stuck_attempts:
+                                    self.log("No new items past the last known one, ending this pass", "INFO")
+                                    break
                             
-                            self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.RIGHT)
-                            time.sleep(fast_delay)
-                            
-                            media_elements = self.driver.find_elements(By.CSS_SELECTOR, "img[data-visualcompletion='media-vc-image'], video[src*='fbcdn'], video[data-sigil='inline-video'], video[src*='video-ak']")
-                            if not media_elements:
+                            self.navigate_next(fast_delay)
+                            probe = self.wait_for_media_change(previous_probe)
+                            if not probe["hasMedia"]:
                                 self.log("No media elements found during recheck, checking again...", "WARNING")
                                 time.sleep(self.delay_map[self.speed]["grab"])
-                                if not self.driver.find_elements(By.CSS_SELECTOR, "img[data-visualcompletion='media-vc-image'], video[src*='fbcdn'], video[data-sigil='inline-video'], video[src*='video-ak']"):
+                                probe = self.probe_media()
+                                if not probe["hasMedia"]:
                                     self.log("Confirmed end of album during recheck", "INFO")
                                     break
                             
@@ -404,17 +1337,21 @@ class FacebookAlbumScraper:
                             
                         except Exception as e:
                             self.log(f"Error during fast rewind check: {e}", "ERROR")
+                            probe = None
                             self.log("Suspected crash, waiting before retry...", "WARNING")
                             time.sleep(self.delay_map[self.speed]["recheck"])
-                            if not self.select_first_media(album_url):
+                            if not self.seek_to_last_known(media_urls, album_url, last_visited):
                                 self.log("Failed to recover after crash, stopping recheck", "ERROR")
                                 break
                     
+                    self.recovery_steps += recheck_steps
                     if len(media_urls) > previous_count:
-                        self.log(f"Recheck added {len(media_urls) - previous_count} new URLs", "INFO")
-                        break
+                        self.log(f"Recheck added {len(media_urls) - previous_count} new URLs in {recheck_steps} steps", "INFO")
+                        # Only a pass past the last known item is followed by another attempt, to look for earlier gaps
+                        if attempt > 0 or len(media_urls) >= max_media:
+                            break
                     else:
-                        self.log("No new URLs found during recheck, waiting before next attempt...", "WARNING")
+                        self.log(f"No new URLs found during recheck ({recheck_steps} steps), waiting before next attempt...", "WARNING")
                         time.sleep(self.delay_map[self.speed]["recheck"])
                         if attempt == max_recheck_attempts - 1:
                             self.log("No additional media found after all recheck attempts, stopping", "INFO")
@@ -430,85 +1367,709 @@ class FacebookAlbumScraper:
         
         if url_file_path and media_urls:
             self.save_urls_to_file(media_urls, url_file_path)
+        self.log_step_latencies(self.delay_map[self.speed]["grab"])
+        if self.recovery_steps:
+            self.log(f"Recovery and recheck cost {self.recovery_steps} steps")
         self.log(f"Finished collecting {len(media_urls)} media URLs")
         return media_urls
 
-    def download_media_from_url(self, media_url, file_path, media_type):
+    def normalize_permalink(self, url):
+        # Grid links carry tracking parameters that the viewer's own URL does not
+        parsed = urlparse(url)
+        query = parse_qs(parsed.query)
+        kept = [(k, query[k][0]) for k in ('fbid', 'set', 'v') if k in query]
+        return urlunparse(parsed._replace(query=urlencode(kept), fragment=''))
+
+    @timed_phase
+    def harvest_album_permalinks(self, album_url, max_media, known=()):
+        album_id = parse_qs(urlparse(album_url).query).get('set', [''])[0]
+        self.driver.get(album_url)
+        permalinks = []
+        seen = set(known)
+        scrolls = 0
+        idle_scrolls = 0
+        while len(permalinks) + len(known) < max_media and idle_scrolls < 3 and not self.stop_requested:
+            found = self.driver.execute_script(self.GRID_LINKS_SCRIPT, album_id)
+            scrolls += 1
+            added = 0
+            for href in found["links"]:
+                key = self.normalize_permalink(href)
+                if key not in seen:
+                    seen.add(key)
+                    permalinks.append(href)
+                    added += 1
+            idle_scrolls = 0 if added else idle_scrolls + 1
+            self.update_progress(len(permalinks), max_media, f"Harvested {len(permalinks)} permalinks")
+            # Lazy loading is done once the page holds more anchors than it did before this scroll
+            try:
+                WebDriverWait(self.driver, self.navigation_timeout, poll_frequency=0.2).until(
+                    lambda driver: driver.execute_script(self.GRID_COUNT_SCRIPT) > found["anchorCount"])
+            except TimeoutException:
+                pass
+        self.log(f"Harvested {len(permalinks)} new permalinks from the album grid in {scrolls} scrolls")
+        return permalinks[:max(0, max_media - len(known))]
+
+    def create_resolver(self, worker_index):
+        resolver = FacebookAlbumScraper(
+            headless=self.headless, log_callback=self.log_callback, combined_log_callback=self.combined_log_callback,
+            speed=self.speed, debug_port=self.debug_port + 100 * worker_index, driver_path=self.driver_path,
+            driver_cache_file=self.driver_cache_file, navigation_timeout=self.navigation_timeout,
+            capture_mode=self.capture_mode, browser_limit=self.browser_limit)
+        # Resolver sessions report into this album's metrics
+        resolver.metrics = self.metrics
+        # The caller has already taken this resolver's browser slot
+        resolver.browser_slot_held = True
+        return resolver
+
+    def resolve_permalink(self, permalink):
+        if not self.navigate_to_media(permalink):
+            return None
+        def media_loaded(driver):
+            probe = driver.execute_script(self.MEDIA_PROBE_SCRIPT)
+            return probe if probe["src"] else False
+        
         try:
-            file_path = os.path.normpath(file_path)
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            }
-            response = requests.get(media_url, headers=headers, stream=True)
-            if response.status_code == 200:
-                with open(file_path, 'wb') as f:
-                    for chunk in response.iter_content(1024):
-                        f.write(chunk)
-                self.log(f"Successfully saved {media_type}: {os.path.basename(file_path)}")
+            probe = WebDriverWait(self.driver, self.navigation_timeout, poll_frequency=0.05).until(media_loaded)
+        except TimeoutException:
+            probe = None
+        media_url, media_type, original_url = self.get_media_url(probe)
+        return (media_url, media_type, original_url or permalink) if media_url else None
+
+    @timed_phase
+    def collect_media_urls_from_grid(self, album_url, max_media=5000, url_file_path=None, media_feed=None):
+        media_index = CollectedMediaIndex(self.load_urls_from_file(url_file_path) if url_file_path else [])
+        media_urls = media_index.items
+        if media_feed:
+            for entry in media_urls:
+                media_feed.put(entry)
+        known = {self.normalize_permalink(entry[2]) for entry in media_urls if entry[2]}
+        permalinks = self.harvest_album_permalinks(album_url, max_media, known)
+        
+        # Each extra resolver is its own browser session logged in with this session's cookies
+        cookies = self.export_cookies()
+        # Extra sessions only start while the shared browser limit has room, otherwise fewer resolvers are used
+        resolvers = [self]
+        for n in range(1, min(self.resolver_workers, len(permalinks))):
+            if not self.browser_limit.try_acquire():
+                self.log(f"Browser limit of {self.browser_limit.max_browsers} reached, resolving with {len(resolvers)} sessions", "WARNING")
+                break
+            resolvers.append(self.create_resolver(n))
+        work = queue.Queue()
+        for item in enumerate(permalinks):
+            work.put(item)
+        results = queue.Queue()
+        
+        def resolve(number, resolver):
+            try:
+                if resolver is not self:
+                    # A session that cannot start leaves its share of the work to the others, but says so
+                    try:
+                        resolver.setup_driver()
+                        logged_in = resolver.driver is not None and resolver.login_with_cookies(album_url, cookies)
+                    except Exception as e:
+                        self.log(f"Resolver session {number} could not start: {e}", "WARNING")
+                        return
+                    if not logged_in:
+                        self.log(f"Resolver session {number} could not log in, continuing without it", "WARNING")
+                        return
+                while not self.stop_requested:
+                    try:
+                        i, permalink = work.get_nowait()
+                    except queue.Empty:
+                        return True
+                    try:
+                        results.put((i, resolver.resolve_permalink(permalink)))
+                    except Exception as e:
+                        self.log(f"Failed to resolve {permalink}: {e}", "WARNING")
+                        results.put((i, None))
                 return True
+            finally:
+                if resolver is not self:
+                    resolver.close()
+        
+        self.log(f"Resolving {len(permalinks)} permalinks with {len(resolvers)} browser sessions")
+        resolve_start = time.monotonic()
+        resolved = {}
+        next_index = 0
+        with ThreadPoolExecutor(max_workers=len(resolvers)) as executor:
+            futures = [executor.submit(resolve, number, resolver) for number, resolver in enumerate(resolvers)]
+            # Entries are appended in grid order so numbering matches the album regardless of which session finished first
+            while next_index < len(permalinks) and not self.stop_requested:
+                try:
+                    i, entry = results.get(timeout=0.5)
+                except queue.Empty:
+                    if all(future.done() for future in futures) and results.empty():
+                        break
+                    continue
+                resolved[i] = entry
+                while next_index in resolved:
+                    entry = resolved.pop(next_index)
+                    next_index += 1
+                    if entry and media_index.add(*entry):
+                        self.log(f"Collected {entry[1]} URL {len(media_urls)}/{max_media}: {entry[0]}")
+                        self.update_progress(len(media_urls), max_media, f"Collected {len(media_urls)} URLs")
+                        if url_file_path:
+                            self.append_url_to_journal(media_urls, url_file_path)
+                        if media_feed:
+                            media_feed.put(media_urls[-1])
+        sessions = 0
+        for number, future in enumerate(futures):
+            if future.exception():
+                self.log(f"Resolver session {number} failed: {future.exception()}", "WARNING")
+            elif future.result():
+                sessions += 1
+        
+        elapsed = time.monotonic() - resolve_start
+        if url_file_path and media_urls:
+            self.save_urls_to_file(media_urls, url_file_path)
+        self.log(f"Finished collecting {len(media_urls)} media URLs from the grid "
+                 f"({next_index / elapsed if elapsed else 0:.1f} items/s with {sessions} of {len(resolvers)} sessions)")
+        return media_urls
+
+    @timed_phase
+    def collect_new_media(self, album_url, album_count, url_file_path):
+        media_index = CollectedMediaIndex(self.load_urls_from_file(url_file_path))
+        media_urls = media_index.items
+        archived_count = len(media_urls)
+        archived_tail = media_urls[-1][2] if media_urls else None
+        expected_new = album_count - archived_count
+        self.log(f"Album reports {album_count} media items, {archived_count} already archived")
+        
+        if not self.select_first_media(album_url):
+            return media_urls
+        
+        # New uploads appear at the front of the album, so the walk ends at the first permalink already on file
+        probe = None
+        steps = 0
+        while not self.stop_requested:
+            try:
+                probe = probe or self.probe_media()
+                media_url, media_type, original_url = self.get_media_url(probe)
+                steps += 1
+                if original_url and media_index.has_original(original_url):
+                    self.log(f"Reached already archived media after {steps} steps")
+                    break
+                if media_url and media_index.add(media_url, media_type, original_url):
+                    if archived_tail and len(media_urls) == archived_count + 1:
+                        self.save_resume_url(url_file_path, archived_tail)
+                    self.log(f"Collected new {media_type} URL {len(media_urls) - archived_count}: {media_url}")
+                    self.update_progress(len(media_urls) - archived_count, max(expected_new, 1), "Collecting new media URLs...")
+                    self.append_url_to_journal(media_urls, url_file_path)
+                    if len(media_urls) - archived_count >= expected_new > 0:
+                        self.log(f"Collected all {expected_new} new media items after {steps} steps")
+                        break
+                
+                previous_probe = probe
+                self.navigate_next(self.delay_map[self.speed]["grab"])
+                probe = self.wait_for_media_change(previous_probe)
+                if not probe["hasMedia"]:
+                    self.log("Reached end of album", "INFO")
+                    break
+            except Exception as e:
+                self.log(f"Error during album sync: {e}", "WARNING")
+                break
+        
+        new_count = len(media_urls) - archived_count
+        if new_count:
+            self.save_urls_to_file(media_urls, url_file_path)
+        else:
+            self.log("Album is already up to date")
+        if len(media_urls) < album_count and not self.stop_requested:
+            self.log(f"{album_count - len(media_urls)} media items are still not archived; "
+                     f"use Resume Grab to continue from the last item archived before this sync", "WARNING")
+        return media_urls
+
+    def get_session(self):
+        # One keep-alive connection pool per scraper, shared by all workers and albums
+        with self.session_lock:
+            if self.session is None:
+                self.session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.download_workers)
+                self.session.mount('https://', adapter)
+                self.session.mount('http://', adapter)
+                self.session.headers.update({
+                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+                })
+            return self.session
+
+    def get_chunk_size(self, content_length):
+        if not content_length:
+            return 64 * 1024
+        return max(64 * 1024, min(1024 * 1024, content_length // 16))
+
+    def get_manifest_path(self, folder_path):
+        return os.path.normpath(os.path.join(folder_path, "download_manifest.jsonl"))
+
+    def load_download_manifest(self, folder_path):
+        manifest = {}
+        manifest_path = self.get_manifest_path(folder_path)
+        if not os.path.exists(manifest_path):
+            return manifest
+        with open(manifest_path, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                manifest[record["file"]] = record
+        return manifest
+
+    def record_download(self, file_path, size, digest=None):
+        record = {"file": os.path.basename(file_path), "size": size}
+        if digest:
+            record["sha256"] = digest
+        with self.manifest_lock:
+            with open(self.get_manifest_path(os.path.dirname(file_path)), 'a') as f:
+                f.write(json.dumps(record) + "\n")
+
+    def load_part_meta(self, part_path):
+        try:
+            with open(part_path + ".json", 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save_part_meta(self, part_path, meta):
+        with open(part_path + ".json", 'w') as f:
+            json.dump(meta, f)
+
+    def discard_part(self, part_path):
+        for path in (part_path, part_path + ".json"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def download_media_from_url(self, media_url, file_path, media_type):
+        file_path = os.path.normpath(file_path)
+        file_name = os.path.basename(file_path)
+        part_path = file_path + ".part"
+        attempt = 0
+        while True:
+            try:
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                return self.transfer_media(media_url, file_path, part_path, media_type)
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                attempt += 1
+                self.metrics.count("download.retries")
+                if attempt > self.download_retries or self.stop_requested:
+                    self.log(f"Failed to download {media_type}: {e}", "ERROR")
+                    return False
+                self.log(f"Connection lost while saving {file_name}, retrying ({attempt}/{self.download_retries})...", "WARNING")
+            except MediaUrlExpired:
+                raise
+            except Exception as e:
+                self.log(f"Failed to download {media_type}: {e}", "ERROR")
+                return False
+
+    def transfer_media(self, media_url, file_path, part_path, media_type):
+        file_name = os.path.basename(file_path)
+        headers = {}
+        offset = 0
+        meta = self.load_part_meta(part_path)
+        if meta and meta.get("url") == media_url and os.path.exists(part_path):
+            offset = os.path.getsize(part_path)
+            # If-Range makes the server send the whole file again if it changed since the partial transfer
+            validator = meta.get("etag") or meta.get("last_modified")
+            if offset and validator:
+                headers['Range'] = f"bytes={offset}-"
+                headers['If-Range'] = validator
+            else:
+                offset = 0
+        
+        with self.get_session().get(media_url, headers=headers, stream=True, timeout=30) as response:
+            content_length = int(response.headers.get('Content-Length') or 0)
+            if response.status_code == 206 and offset:
+                match = re.match(r'bytes (\d+)-\d+/(\d+|\*)', response.headers.get('Content-Range', ''))
+                if not match or int(match.group(1)) != offset:
+                    self.discard_part(part_path)
+                    raise requests.ConnectionError(f"Unexpected Content-Range for {file_name}, restarting download")
+                expected_size = int(match.group(2)) if match.group(2) != '*' else 0
+                mode = 'ab'
+                self.log(f"Resuming {file_name} from byte {offset}")
+            elif response.status_code == 200:
+                if offset:
+                    self.log(f"Server did not resume {file_name}, downloading it again from the start", "WARNING")
+                # Content-Length counts encoded bytes, so it only checks identity-encoded bodies
+                expected_size = content_length if not response.headers.get('Content-Encoding') else 0
+                offset = 0
+                mode = 'wb'
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+                # The part file holds decoded bytes, which only line up with byte ranges when nothing was encoded
+                resumable = (response.headers.get('Accept-Ranges', '').lower() == 'bytes'
+                             and not response.headers.get('Content-Encoding'))
+                if resumable and (etag or last_modified):
+                    self.save_part_meta(part_path, {"url": media_url, "etag": etag, "last_modified": last_modified})
+                elif os.path.exists(part_path + ".json"):
+                    os.remove(part_path + ".json")
+            elif response.status_code in (403, 410) and self.is_expiry_failure(media_url, response):
+                raise MediaUrlExpired(f"Link for {file_name} has expired")
+            elif offset:
+                # The server refused the range (416 or otherwise), so the partial file goes and one plain request follows
+                self.log(f"Server refused to resume {file_name} (Status {response.status_code}), downloading it again from the start", "WARNING")
+                response.close()
+                self.discard_part(part_path)
+                return self.transfer_media(media_url, file_path, part_path, media_type)
             else:
                 self.log(f"Failed to download {media_type} from URL: Status {response.status_code}", "ERROR")
                 return False
+            
+            digest = hashlib.sha256() if self.verify_hashes else None
+            if digest and offset:
+                with open(part_path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                        digest.update(chunk)
+            written = offset
+            try:
+                with open(part_path, mode) as f:
+                    for chunk in response.iter_content(self.get_chunk_size(expected_size or content_length)):
+                        f.write(chunk)
+                        written += len(chunk)
+                        if digest:
+                            digest.update(chunk)
+            finally:
+                with self.transfer_lock:
+                    self.bytes_downloaded += written - offset
+                self.metrics.count("download.bytes", written - offset)
+        
+        if expected_size and written != expected_size:
+            if not os.path.exists(part_path + ".json"):
+                os.remove(part_path)
+            raise requests.ConnectionError(f"Incomplete {media_type} {file_name}: {written}/{expected_size} bytes")
+        os.replace(part_path, file_path)
+        if os.path.exists(part_path + ".json"):
+            os.remove(part_path + ".json")
+        self.record_download(file_path, written, digest.hexdigest() if digest else None)
+        self.log(f"Successfully saved {media_type}: {file_name}")
+        return True
+
+    @timed_phase
+    def save_from_browser(self, index, media_url, media_type, folder_path):
+        # Videos arrive as range-requested segments, so only photos can be taken whole from the browser
+        if media_type != 'image' or not self.network_log:
+            return False
+        try:
+            self.network_log.feed(self.driver.get_log('performance'))
+            response = self.network_log.find_response(media_url)
+            if not response or not response["request_id"]:
+                return False
+            body = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': response["request_id"]})
+            data = base64.b64decode(body['body']) if body.get('base64Encoded') else body['body'].encode('latin-1')
+            if not data:
+                return False
+            file_name = self.get_media_file_name(index, media_type)
+            file_path = os.path.normpath(os.path.join(folder_path, file_name))
+            os.makedirs(folder_path, exist_ok=True)
+            with open(file_path + ".part", 'wb') as f:
+                f.write(data)
+            os.replace(file_path + ".part", file_path)
+            self.record_download(file_path, len(data), hashlib.sha256(data).hexdigest() if self.verify_hashes else None)
+            with self.transfer_lock:
+                self.browser_saved_files.add(file_path)
+                self.bytes_reused += len(data)
+            self.metrics.count("download.bytes_reused", len(data))
+            self.log(f"Saved {media_type} {file_name} from browser cache")
+            return True
         except Exception as e:
-            self.log(f"Failed to download {media_type}: {e}", "ERROR")
+            self.log(f"Browser cache miss for media {index}, will download it instead: {e}", "WARNING")
             return False
 
+    def log_transfer_totals(self):
+        megabytes = lambda n: n / (1024 * 1024)
+        self.log(f"Bytes over the wire: {megabytes(self.bytes_downloaded):.1f} MB downloaded by HTTP, "
+                 f"{megabytes(self.bytes_reused):.1f} MB reused from the browser")
+        self.bytes_downloaded = 0
+        self.bytes_reused = 0
+
+    def get_url_expiry(self, media_url):
+        # fbcdn signs links with an "oe" parameter holding the expiry as a hex Unix timestamp
+        try:
+            return int(parse_qs(urlparse(media_url).query)['oe'][0], 16)
+        except (KeyError, IndexError, ValueError):
+            return None
+
+    def is_expiry_failure(self, media_url, response):
+        expiry = self.get_url_expiry(media_url)
+        if expiry and expiry <= time.time() + 60:
+            return True
+        try:
+            return 'signature expired' in response.text.lower()
+        except Exception:
+            return False
+
+    def schedule_by_expiry(self, items, window=256):
+        # A bounded lookahead fetches the links that lapse soonest first while keeping progress close to in order
+        heap = []
+        for i, entry in items:
+            heapq.heappush(heap, (self.get_url_expiry(entry[0]) or float('inf'), i, entry))
+            if len(heap) >= window:
+                _, i, entry = heapq.heappop(heap)
+                yield i, entry
+        while heap:
+            _, i, entry = heapq.heappop(heap)
+            yield i, entry
+
+    @timed_phase
+    def reresolve_expired_media(self, expired):
+        self.log(f"{len(expired)} media links have expired, re-resolving them from their permalinks")
+        # A browser that cannot start or log in only costs the expired items, not the finished download pass
+        try:
+            if not self.driver:
+                self.setup_driver()
+                if not self.driver:
+                    return {}
+            first_permalink = next((original_url for _, _, original_url in expired if original_url), None)
+            logged_in = first_permalink and self.wait_for_login(first_permalink)
+        except Exception as e:
+            self.log(f"Could not start a browser to re-resolve expired links: {e}", "ERROR")
+            return {}
+        if not logged_in:
+            self.log("Cannot re-resolve expired links without a logged-in browser", "ERROR")
+            return {}
+        
+        refreshed = {}
+        page_loads = 0
+        for i, media_type, original_url in expired:
+            if self.stop_requested:
+                break
+            if not original_url:
+                self.log(f"Media {i} has no permalink to re-resolve from", "WARNING")
+                continue
+            page_loads += 1
+            if not self.navigate_to_media(original_url):
+                continue
+            media_url, new_type, _ = self.get_media_url()
+            if media_url:
+                refreshed[i] = [media_url, new_type or media_type, original_url]
+            else:
+                self.log(f"Could not re-resolve media {i} from {original_url}", "WARNING")
+        self.log(f"Re-resolved {len(refreshed)}/{len(expired)} expired links with {page_loads} page loads")
+        return refreshed
+
+    def retry_expired_media(self, expired, media_urls, folder_path):
+        refreshed = self.reresolve_expired_media(expired)
+        if not refreshed:
+            return 0
+        
+        # Persist the fresh links so the next run does not have to resolve them again
+        if isinstance(media_urls, list):
+            for i, entry in refreshed.items():
+                media_urls[i - 1] = entry
+        if isinstance(media_urls, MediaUrlStream):
+            url_file_path = media_urls.file_path
+        else:
+            url_file_path = os.path.normpath(os.path.join(folder_path, "media_urls.json"))
+        urls = self.load_urls_from_file(url_file_path)
+        for i, entry in refreshed.items():
+            if i <= len(urls):
+                urls[i - 1] = entry
+        if urls:
+            self.save_urls_to_file(urls, url_file_path)
+        
+        successful_downloads = 0
+        with ThreadPoolExecutor(max_workers=self.download_workers) as executor:
+            futures = []
+            for i, (media_url, media_type, original_url) in refreshed.items():
+                file_path = os.path.normpath(os.path.join(folder_path, self.get_media_file_name(i, media_type)))
+                futures.append(executor.submit(self.download_worker, i, media_url, file_path, media_type))
+            for future in futures:
+                i, success = future.result()
+                if success:
+                    successful_downloads += 1
+                elif not self.stop_requested:
+                    self.log(f"Failed to save media {i} after re-resolving its link", "WARNING")
+        return successful_downloads
+
+    def get_media_file_name(self, index, media_type):
+        file_ext = 'mp4' if media_type == 'video' else 'jpg'
+        return f"{index:03d}.{file_ext}"
+
+    def scan_album_folder(self, folder_path):
+        present = {}
+        try:
+            with os.scandir(folder_path) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        # DirEntry caches stat data, so sizes cost no extra syscall on Windows
+                        present[entry.name] = entry
+        except FileNotFoundError:
+            pass
+        return present
+
+    def is_media_present(self, file_name, present, manifest):
+        entry = present.get(file_name)
+        if entry is None:
+            return False
+        if file_name in manifest and entry.stat().st_size != manifest[file_name]["size"]:
+            # Size differs from what was recorded at download time, so the file is damaged
+            del present[file_name]
+            return False
+        return True
+
+    def plan_resume(self, media_urls, folder_path, max_media=None):
+        # One directory scan instead of a stat per item; counts every gap, not just the first
+        present = self.scan_album_folder(folder_path)
+        manifest = self.load_download_manifest(folder_path)
+        first_missing = None
+        missing = 0
+        mismatched = 0
+        count = 0
+        for i, (media_url, media_type, original_url) in islice(enumerate(media_urls, 1), max_media):
+            file_name = self.get_media_file_name(i, media_type)
+            on_disk = file_name in present
+            if not self.is_media_present(file_name, present, manifest):
+                # A file that was there but failed the check has the wrong size; one that was never there is just missing
+                if on_disk:
+                    mismatched += 1
+                missing += 1
+                first_missing = first_missing or i
+            count = i
+        if mismatched:
+            self.log(f"{mismatched} files do not match their recorded size and will be downloaded again", "WARNING")
+        resume_index = first_missing - 1 if first_missing else count
+        return resume_index, missing, present
+
     def find_resume_index(self, media_urls, main_folder, album_folder):
         folder_path = os.path.normpath(os.path.join(main_folder, album_folder))
-        last_file = 0
-        for i, (media_url, media_type, original_url) in enumerate(media_urls, 1):
-            file_ext = 'mp4' if media_type == 'video' else 'jpg'
-            file_path = os.path.normpath(os.path.join(folder_path, f"{i:03d}.{file_ext}"))
-            if not os.path.exists(file_path):
-                return i - 1
-            last_file = i
-        return last_file
-
-    def download_media(self, media_urls, main_folder, album_folder, max_media=5000):
-        resume_index = self.find_resume_index(media_urls, main_folder, album_folder)
+        return self.plan_resume(media_urls, folder_path)[0]
+
+    def download_worker(self, index, media_url, file_path, media_type):
+        should_stop = lambda: self.stop_requested
+        if not self.download_limiter.acquire(should_stop):
+            return index, False
+        try:
+            if not self.download_limiter.wait_for_turn(should_stop):
+                return index, False
+            time.sleep(self.delay_map[self.speed]["download"])
+            if self.stop_requested:
+                return index, False
+            start = time.monotonic()
+            success = self.download_media_from_url(media_url, file_path, media_type)
+            self.metrics.observe("download", time.monotonic() - start)
+            self.metrics.count("download.succeeded" if success else "download.failed")
+            return index, success
+        except MediaUrlExpired as e:
+            self.metrics.count("download.expired_links")
+            self.log(f"{e}, queued for re-resolution", "WARNING")
+            return index, None
+        finally:
+            self.download_limiter.release()
+
+    def get_total_media(self, media_urls, max_media=None):
+        if isinstance(media_urls, (MediaUrlStream, MediaUrlFeed)):
+            total = media_urls.estimated_total()
+        else:
+            total = len(media_urls)
+        return total if max_media is None else min(total, max_media)
+
+    @timed_phase
+    def download_media(self, media_urls, main_folder, album_folder, max_media=None):
+        folder_path = os.path.normpath(os.path.join(main_folder, album_folder))
+        self.report_folder = folder_path
+        if isinstance(media_urls, (MediaUrlFeed, MediaUrlStream)):
+            # Entries are checked against one folder scan as they are read, so downloads start without a full parse
+            resume_index = 0
+            missing = None
+            present = self.scan_album_folder(folder_path)
+            manifest = self.load_download_manifest(folder_path)
+        else:
+            resume_index, missing, present = self.plan_resume(media_urls, folder_path, max_media)
+            manifest = {}
+        total_media = self.get_total_media(media_urls, max_media)
         if resume_index > 0:
-            self.log(f"Resuming from media {resume_index + 1}/{len(media_urls)}")
+            self.log(f"Resuming from media {resume_index + 1}/{total_media}")
+        if missing and missing < total_media - resume_index:
+            self.log(f"{missing} media items missing, including gaps after media {resume_index + 1}")
         
         successful_downloads = resume_index
-        total_media = min(len(media_urls), max_media)
         
-        self.log(f"Starting download of {total_media} media items")
+        self.log(f"Starting download of {total_media} media items with {self.download_workers} workers (max {self.download_limiter.max_rps} req/s)")
         self.update_progress(resume_index, total_media, "Starting download...")
         
-        folder_path = os.path.normpath(os.path.join(main_folder, album_folder))
-        
-        for i, (media_url, media_type, original_url) in enumerate(media_urls[resume_index:], resume_index + 1):
-            if self.stop_requested:
-                self.log("Download stopped by user", "WARNING")
-                break
+        items = islice(enumerate(media_urls, 1), resume_index, max_media)
+        if not isinstance(media_urls, MediaUrlFeed):
+            items = self.schedule_by_expiry(items)
+        file_names = {}
+        in_flight = {}
+        expired = []
+        finished = set()
+        next_report = resume_index + 1
+        pending = set()
+        
+        with ThreadPoolExecutor(max_workers=self.download_workers) as executor:
+            exhausted = False
+            while not exhausted or pending:
+                # Keep a bounded number of items in flight so stop requests take effect quickly
+                while not exhausted and not self.stop_requested and len(pending) < self.download_workers * 2:
+                    try:
+                        i, (media_url, media_type, original_url) = next(items)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    
+                    file_name = self.get_media_file_name(i, media_type)
+                    file_path = os.path.normpath(os.path.join(folder_path, file_name))
+                    file_names[i] = file_name
+                    
+                    if self.is_media_present(file_name, present, manifest) or file_path in self.browser_saved_files:
+                        successful_downloads += 1
+                        finished.add(i)
+                        continue
+                    
+                    expiry = self.get_url_expiry(media_url)
+                    if expiry and expiry <= time.time():
+                        expired.append((i, media_type, original_url))
+                        finished.add(i)
+                        continue
+                    
+                    self.log(f"Saving {media_type} {i}/{total_media}: {file_name} from {media_url}")
+                    in_flight[i] = (media_type, original_url)
+                    pending.add(executor.submit(self.download_worker, i, media_url, file_path, media_type))
                 
-            file_ext = 'mp4' if media_type == 'video' else 'jpg'
-            file_name = f"{i:03d}.{file_ext}"
-            file_path = os.path.normpath(os.path.join(folder_path, file_name))
-            
-            if os.path.exists(file_path):
-                self.log(f"Skipping {file_name}, already exists")
-                successful_downloads += 1
-                self.update_progress(i, total_media, f"Skipped {file_name}")
-                continue
-            
-            self.log(f"Saving {media_type} {i}/{total_media}: {file_name} from {media_url}")
-            self.update_progress(i-1, total_media, f"Saving {file_name}")
-            
-            if self.download_media_from_url(media_url, file_path, media_type):
-                successful_downloads += 1
-            else:
-                self.log(f"Failed to save {media_type} {i}/{total_media}", "WARNING")
-            
-            time.sleep(self.delay_map[self.speed]["download"])
-        
+                if self.stop_requested and not exhausted:
+                    self.log("Download stopped by user", "WARNING")
+                    exhausted = True
+                
+                if pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        i, success = future.result()
+                        media_type, original_url = in_flight.pop(i)
+                        if success:
+                            successful_downloads += 1
+                        elif success is None:
+                            expired.append((i, media_type, original_url))
+                        elif not self.stop_requested:
+                            self.log(f"Failed to save media {i}/{total_media}", "WARNING")
+                        finished.add(i)
+                
+                # Report progress in order so the bar matches what find_resume_index will see
+                last_name = None
+                while next_report in finished:
+                    finished.discard(next_report)
+                    last_name = file_names.pop(next_report)
+                    next_report += 1
+                if last_name:
+                    total_media = self.get_total_media(media_urls, max_media)
+                    self.update_progress(next_report - 1, total_media, f"Saved {last_name}")
+        
+        if expired and not self.stop_requested:
+            expired.sort()
+            successful_downloads += self.retry_expired_media(expired, media_urls, folder_path)
+        
+        if self.stop_requested:
+            self.log(f"Download stopped: {successful_downloads}/{total_media} media items saved", "WARNING")
+            return successful_downloads
+        
+        total_media = self.get_total_media(media_urls, max_media)
         self.log(f"Download completed: {successful_downloads}/{total_media} media items saved")
         self.update_progress(total_media, total_media, "Download completed")
         return successful_downloads
 
-    def grab_links_only(self, album_url, main_folder, album_title, max_media=5000):
+    @instrumented_run("grab")
+    def grab_links_only(self, album_url, main_folder, album_title, max_media=5000, sync=False):
         try:
+            self.run_started = time.monotonic()
+            self.first_media_reported = False
             self.log(f"Starting to grab links for album: {album_url}")
             self.update_progress(0, 100, "Initializing browser...")
             
@@ -534,8 +2095,12 @@ class FacebookAlbumScraper:
             folder_path = self.create_folder(main_folder, album_title)
             url_file_path = os.path.normpath(os.path.join(folder_path, "media_urls.json"))
             
-            self.update_progress(30, 100, "Collecting media URLs...")
-            media_urls = self.collect_media_urls(album_url, max_media, url_file_path)
+            if sync and os.path.exists(url_file_path):
+                self.update_progress(30, 100, "Syncing new media URLs...")
+                media_urls = self.collect_new_media(album_url, max_media, url_file_path)
+            else:
+                self.update_progress(30, 100, "Collecting media URLs...")
+                media_urls = self.collect_media_urls(album_url, max_media, url_file_path)
             if media_urls:
                 self.log(f"Successfully saved {len(media_urls)} URLs")
                 self.update_progress(100, 100, "URL collection completed!")
@@ -548,8 +2113,11 @@ class FacebookAlbumScraper:
             self.log(f"Error during link grabbing: {e}", "ERROR")
             return False
 
+    @instrumented_run("resume")
     def resume_grab_links(self, album_url, json_file_path, max_media=5000):
         try:
+            self.run_started = time.monotonic()
+            self.first_media_reported = False
             self.log(f"Resuming link grabbing for album: {album_url}")
             self.update_progress(0, 100, "Initializing browser...")
             
@@ -573,14 +2141,19 @@ class FacebookAlbumScraper:
             max_media = self.get_media_count()
             
             media_urls = self.load_urls_from_file(json_file_path)
+            self.report_folder = os.path.dirname(os.path.normpath(json_file_path))
             
             if not media_urls:
                 self.log("No URLs found in JSON file to resume from", "ERROR")
                 return False
             
-            last_url = media_urls[-1][2]
+            last_url = self.load_resume_url(json_file_path, media_urls)
+            archived_count = len(media_urls)
             self.update_progress(30, 100, "Resuming media URL collection...")
             media_urls = self.collect_media_urls(album_url, max_media, json_file_path, resume_url=last_url)
+            if len(media_urls) > archived_count:
+                # The walk has appended past the synced items, so the file's last entry is the resume point again
+                self.clear_resume_url(json_file_path)
             if media_urls:
                 self.log(f"Successfully saved {len(media_urls)} URLs")
                 self.update_progress(100, 100, "URL collection completed!")
@@ -593,12 +2166,15 @@ class FacebookAlbumScraper:
             self.log(f"Error during resume link grabbing: {e}", "ERROR")
             return False
 
-    def download_from_json(self, json_file_path, main_folder, max_media=5000):
+    @instrumented_run("download")
+    def download_from_json(self, json_file_path, main_folder, max_media=None):
         try:
-            media_urls = self.load_urls_from_file(json_file_path)
-            if not media_urls:
+            # Stream entries so downloads start without materializing very large archives
+            media_urls = MediaUrlStream(self, json_file_path)
+            if next(iter(media_urls), None) is None:
                 self.log("No URLs found in JSON file", "ERROR")
                 return False
+            self.log(f"Streaming URLs from {os.path.normpath(json_file_path)}")
             
             album_title = os.path.basename(os.path.dirname(json_file_path))
             if not album_title:
@@ -608,6 +2184,7 @@ class FacebookAlbumScraper:
             self.update_progress(90, 100, "Starting media downloads...")
             successful_downloads = self.download_media(media_urls, main_folder, album_title, max_media)
             
+            self.log_transfer_totals()
             self.log(f"Download completed. Saved {successful_downloads} media items")
             self.update_progress(100, 100, "Download completed!")
             return successful_downloads > 0
@@ -615,11 +2192,38 @@ class FacebookAlbumScraper:
             self.log(f"Error during download from JSON: {e}", "ERROR")
             return False
 
+    def write_run_report(self, kind, target, success):
+        if not self.report_folder:
+            return
+        report = {
+            "kind": kind,
+            "target": target,
+            "success": bool(success),
+            "stopped": self.stop_requested,
+            "started": datetime.datetime.fromtimestamp(self.metrics.started).isoformat(timespec='seconds'),
+            "startup": {name: round(seconds, 4) for name, seconds in self.startup_timings.items()},
+            "recovery_steps": self.recovery_steps
+        }
+        report.update(self.metrics.snapshot())
+        report_path = os.path.join(self.report_folder, "run_report.json")
+        try:
+            self.metrics.write_json(report_path, report)
+            if self.metrics.live_path:
+                self.metrics.write_json(self.metrics.live_path, report)
+            self.log(f"Run report saved to {report_path}")
+        except OSError as e:
+            self.log(f"Failed to save run report: {e}", "WARNING")
+
     def stop_scraping(self):
         self.stop_requested = True
         self.log("Stop requested by user", "INFO")
 
     def close(self):
+        for journal_path in list(self.journal_handles):
+            self.close_journal(journal_path)
+        if self.session:
+            self.session.close()
+            self.session = None
         if self.driver:
             try:
                 self.driver.quit()
@@ -628,10 +2232,20 @@ class FacebookAlbumScraper:
             except Exception as e:
                 self.log(f"Error closing browser: {e}", "ERROR")
                 self.driver = None
+        self.release_browser_slot()
+
+    def release_browser_slot(self):
+        if self.browser_slot_held:
+            self.browser_slot_held = False
+            self.browser_limit.release()
 
-    def scrape_album(self, album_url, main_folder="downloaded_albums", max_media=5000):
+    @instrumented_run("scrape")
+    def scrape_album(self, album_url, main_folder="downloaded_albums", max_media=5000, sync=False):
         try:
+            self.run_started = time.monotonic()
+            self.first_media_reported = False
             self.log(f"Starting scrape of album: {album_url}")
+            self.browser_saved_files.clear()
             self.update_progress(0, 100, "Navigating to album...")
             
             if not self.driver:
@@ -659,8 +2273,30 @@ class FacebookAlbumScraper:
             folder_path = self.create_folder(main_folder, album_title)
             url_file_path = os.path.normpath(os.path.join(folder_path, "media_urls.json"))
             
-            self.update_progress(30, 100, "Collecting media URLs...")
-            media_urls = self.collect_media_urls(album_url, max_media, url_file_path)
+            if sync and os.path.exists(url_file_path):
+                # Only the new entries are missing on disk, so the download pass skips straight to them
+                self.update_progress(30, 100, "Syncing new media...")
+                media_urls = self.collect_new_media(album_url, max_media, url_file_path)
+                successful_downloads = self.download_media(media_urls, main_folder, album_title)
+            else:
+                # Download each URL as soon as it is collected instead of waiting for the whole album
+                self.update_progress(30, 100, "Collecting and downloading media...")
+                media_feed = MediaUrlFeed(self, max_media, maxsize=self.download_workers * 4)
+                with ThreadPoolExecutor(max_workers=1) as pipeline:
+                    download_future = pipeline.submit(self.download_media, media_feed, main_folder, album_title)
+                    media_feed.consumer = download_future
+                    try:
+                        media_urls = self.collect_media_urls(album_url, max_media, url_file_path, media_feed=media_feed,
+                                                             browser_save_folder=folder_path if self.reuse_browser_bytes else None)
+                    finally:
+                        media_feed.close()
+                    try:
+                        successful_downloads = download_future.result()
+                    except Exception as e:
+                        # The collected links are already on file, so only the downloads are lost
+                        self.log(f"Download pass failed, links were still collected: {e}", "ERROR")
+                        successful_downloads = 0
+            
             if not media_urls:
                 self.log("No media URLs collected", "ERROR")
                 return False
@@ -668,9 +2304,7 @@ class FacebookAlbumScraper:
             if self.stop_requested:
                 return False
             
-            self.update_progress(90, 100, "Starting media downloads...")
-            successful_downloads = self.download_media(media_urls, main_folder, album_title, max_media)
-            
+            self.log_transfer_totals()
             self.log(f"Scraping completed. Saved {successful_downloads} media items to {folder_path}")
             self.update_progress(100, 100, "Scraping completed!")
             return successful_downloads > 0
@@ -679,134 +2313,196 @@ class FacebookAlbumScraper:
             self.log(f"Error during scraping: {e}", "ERROR")
             return False
 
-class ModernButton(tk.Frame):
-    def __init__(self, parent, text, command=None, bg_color="#FF1493", hover_color="#FF69B4", text_color="white", **kwargs):
-        super().__init__(parent, bg=parent.cget('bg'), **kwargs)
-        
-        self.command = command
-        self.bg_color = bg_color
-        self.hover_color = hover_color
-        self.text_color = text_color
-        self.is_hovered = False
-        self.animation_id = None
-        
-        self.button = tk.Label(self, text=text, bg=bg_color, fg=text_color, 
-                              font=('Segoe UI', 10, 'bold'), relief='flat',
-                              padx=20, pady=8, cursor='hand2')
-        self.button.pack(fill='both', expand=True)
-        
-        self.button.bind('<Button-1>', self._on_click)
-        self.button.bind('<Enter>', self._on_enter)
-        self.button.bind('<Leave>', self._on_leave)
-        
-    def _on_click(self, event):
-        if self.command:
-            self.command()
-    
-    def _on_enter(self, event):
-        self.is_hovered = True
-        self._animate_color(self.bg_color, self.hover_color)
-    
-    def _on_leave(self, event):
-        self.is_hovered = False
-        self._animate_color(self.hover_color, self.bg_color)
-    
-    def _animate_color(self, start_color, end_color):
-        if self.animation_id:
-            self.after_cancel(self.animation_id)
-        
-        steps = 10
-        start_rgb = self._hex_to_rgb(start_color)
-        end_rgb = self._hex_to_rgb(end_color)
-        
-        def animate_step(step):
-            if step <= steps:
-                ratio = step / steps
-                current_rgb = [
-                    int(start_rgb[i] + (end_rgb[i] - start_rgb[i]) * ratio)
-                    for i in range(3)
-                ]
-                current_color = self._rgb_to_hex(current_rgb)
-                self.button.config(bg=current_color)
-                self.animation_id = self.after(20, lambda: animate_step(step + 1))
-        
-        animate_step(0)
-    
-    def _hex_to_rgb(self, hex_color):
-        hex_color = hex_color.lstrip('#')
-        return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-    
-    def _rgb_to_hex(self, rgb):
-        return f"#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}"
-    
-    def config_state(self, state):
-        if state == "disabled":
-            self.button.config(bg="#333333", fg="#666666", cursor='')
-            self.button.unbind('<Button-1>')
-            self.button.unbind('<Enter>')
-            self.button.unbind('<Leave>')
-        else:
-            self.button.config(bg=self.bg_color, fg=self.text_color, cursor='hand2')
+class RotatingLogFile:
+    def __init__(self, path, max_bytes=5 * 1024 * 1024, backups=3):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.handle = None
+    
+    def write_lines(self, lines):
+        if self.handle is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self.handle = open(self.path, 'a', encoding='utf-8')
+        self.handle.write("".join(f"{line}\n" for line in lines))
+        self.handle.flush()
+        if self.handle.tell() >= self.max_bytes:
+            self.rotate()
+    
+    def rotate(self):
+        self.close()
+        for n in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{n}"):
+                os.replace(f"{self.path}.{n}", f"{self.path}.{n + 1}")
+        os.replace(self.path, f"{self.path}.1")
+    
+    def close(self):
+        if self.handle:
+            self.handle.close()
+            self.handle = None
+
+def load_gui():
+    # Tk and the widgets built on it are set up only when the window opens, so command-line runs never import tkinter
+    global tk, ttk, filedialog, messagebox, scrolledtext, ModernButton, AnimatedProgressBar
+    if ModernButton is not None:
+        return
+    import tkinter as tk
+    from tkinter import ttk, filedialog, messagebox, scrolledtext
+    
+    class ModernButton(tk.Frame):
+        def __init__(self, parent, text, command=None, bg_color="#FF1493", hover_color="#FF69B4", text_color="white", **kwargs):
+            super().__init__(parent, bg=parent.cget('bg'), **kwargs)
+        
+            self.command = command
+            self.bg_color = bg_color
+            self.hover_color = hover_color
+            self.text_color = text_color
+            self.is_hovered = False
+            self.animation_id = None
+        
+            self.button = tk.Label(self, text=text, bg=bg_color, fg=text_color, 
+                                  font=('Segoe UI', 10, 'bold'), relief='flat',
+                                  padx=20, pady=8, cursor='hand2')
+            self.button.pack(fill='both', expand=True)
+        
             self.button.bind('<Button-1>', self._on_click)
             self.button.bind('<Enter>', self._on_enter)
             self.button.bind('<Leave>', self._on_leave)
+        
+        def _on_click(self, event):
+            if self.command:
+                self.command()
+    
+        def _on_enter(self, event):
+            self.is_hovered = True
+            self._animate_color(self.bg_color, self.hover_color)
+    
+        def _on_leave(self, event):
+            self.is_hovered = False
+            self._animate_color(self.hover_color, self.bg_color)
+    
+        def _animate_color(self, start_color, end_color):
+            if self.animation_id:
+                self.after_cancel(self.animation_id)
+        
+            steps = 10
+            start_rgb = self._hex_to_rgb(start_color)
+            end_rgb = self._hex_to_rgb(end_color)
+        
+            def animate_step(step):
+                if step <= steps:
+                    ratio = step / steps
+                    current_rgb = [
+                        int(start_rgb[i] + (end_rgb[i] - start_rgb[i]) * ratio)
+                        for i in range(3)
+                    ]
+                    current_color = self._rgb_to_hex(current_rgb)
+                    self.button.config(bg=current_color)
+                    self.animation_id = self.after(20, lambda: animate_step(step + 1))
+        
+            animate_step(0)
+    
+        def _hex_to_rgb(self, hex_color):
+            hex_color = hex_color.lstrip('#')
+            return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+    
+        def _rgb_to_hex(self, rgb):
+            return f"#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}"
+    
+        def config_state(self, state):
+            if state == "disabled":
+                self.button.config(bg="#333333", fg="#666666", cursor='')
+                self.button.unbind('<Button-1>')
+                self.button.unbind('<Enter>')
+                self.button.unbind('<Leave>')
+            else:
+                self.button.config(bg=self.bg_color, fg=self.text_color, cursor='hand2')
+                self.button.bind('<Button-1>', self._on_click)
+                self.button.bind('<Enter>', self._on_enter)
+                self.button.bind('<Leave>', self._on_leave)
 
-class AnimatedProgressBar(tk.Frame):
-    def __init__(self, parent, **kwargs):
-        super().__init__(parent, bg='#1a1a1a', **kwargs)
+    class AnimatedProgressBar(tk.Frame):
+        def __init__(self, parent, **kwargs):
+            super().__init__(parent, bg='#1a1a1a', **kwargs)
         
-        self.canvas = tk.Canvas(self, height=20, bg='#2a2a2a', highlightthickness=0)
-        self.canvas.pack(fill='x', padx=5, pady=5)
+            self.canvas = tk.Canvas(self, height=20, bg='#2a2a2a', highlightthickness=0)
+            self.canvas.pack(fill='x', padx=5, pady=5)
         
-        self.progress = 0
-        self.animation_id = None
+            self.progress = 0
+            self.animation_id = None
+            self.rendered_size = None
+            self.gradient_image = None
+            self.cover_id = None
         
-        self.bind('<Configure>', self._on_resize)
+            self.bind('<Configure>', self._on_resize)
     
-    def _on_resize(self, event):
-        self.update_display()
+        def _on_resize(self, event):
+            self.update_display()
     
-    def set_progress(self, value):
-        target = max(0, min(100, value))
-        self.animate_to(target)
+        def set_progress(self, value):
+            target = max(0, min(100, value))
+            self.animate_to(target)
     
-    def animate_to(self, target):
-        if self.animation_id:
-            self.after_cancel(self.animation_id)
-        
-        def animate_step():
-            diff = target - self.progress
-            if abs(diff) < 0.5:
-                self.progress = target
+        def animate_to(self, target):
+            if self.animation_id:
+                self.after_cancel(self.animation_id)
+        
+            def animate_step():
+                diff = target - self.progress
+                if abs(diff) < 0.5:
+                    self.progress = target
+                    self.update_display()
+                    return
+                self.progress += diff * 0.1
                 self.update_display()
-                return
-            self.progress += diff * 0.1
-            self.update_display()
-            self.animation_id = self.after(16, animate_step)
+                self.animation_id = self.after(16, animate_step)
         
-        animate_step()
+            animate_step()
     
-    def update_display(self):
-        self.canvas.delete('all')
-        if self.canvas.winfo_width() <= 1:
-            return
-        
-        width = self.canvas.winfo_width()
-        height = self.canvas.winfo_height()
-        
-        self.canvas.create_rectangle(2, 2, width-2, height-2, fill='#333333', outline='#555555')
-        
-        progress_width = (width - 4) * (self.progress / 100)
-        if progress_width > 0:
-            for i in range(int(progress_width)):
-                ratio = i / max(1, progress_width)
-                r = int(255 * (1 - ratio) + 255 * ratio)
+        def build_gradient(self, width, height):
+            # The gradient is drawn once per size; each frame only moves the cover over the unfilled part
+            self.canvas.delete('all')
+            self.canvas.create_rectangle(2, 2, width-2, height-2, fill='#333333', outline='#555555')
+            bar_width = max(1, width - 4)
+            bar_height = max(1, height - 4)
+            colors = []
+            for i in range(bar_width):
+                ratio = i / bar_width
+                r = 255
                 g = int(20 * (1 - ratio) + 105 * ratio)
                 b = int(147 * (1 - ratio) + 180 * ratio)
-                color = f"#{r:02x}{g:02x}{b:02x}"
-                self.canvas.create_line(2 + i, 2, 2 + i, height-2, fill=color, width=1)
+                colors.append(f"#{r:02x}{g:02x}{b:02x}")
+            self.gradient_image = tk.PhotoImage(width=bar_width, height=bar_height)
+            self.gradient_image.put("{" + " ".join(colors) + "}", to=(0, 0, bar_width, bar_height))
+            self.canvas.create_image(2, 2, image=self.gradient_image, anchor='nw')
+            self.cover_id = self.canvas.create_rectangle(2, 2, width-2, height-2, fill='#333333', width=0)
+            self.rendered_size = (width, height)
+    
+        def update_display(self):
+            if self.canvas.winfo_width() <= 1:
+                return
+        
+            width = self.canvas.winfo_width()
+            height = self.canvas.winfo_height()
+            if self.rendered_size != (width, height):
+                self.build_gradient(width, height)
+        
+            progress_width = (width - 4) * (self.progress / 100)
+            self.canvas.coords(self.cover_id, 2 + progress_width, 2, width-2, height-2)
 
 class FacebookScraperGUI:
+    # Log lines are queued by worker threads and drained by the Tk loop, spending at most the budget per frame
+    LOG_DRAIN_INTERVAL_MS = 50
+    LOG_DRAIN_BUDGET = 0.015
+    # Only the most recent lines per album stay in memory and in the widget; the full history goes to rotating files
+    LOG_RETENTION = 2000
+    LOG_VIEW_LINES = 500
+    LOG_DIR = os.path.join(os.path.expanduser("~"), ".fb_album_scraper", "logs")
+    # Workers may report progress per item; the bar and label are refreshed at most this often
+    PROGRESS_REFRESH_MS = 100
+    # Chrome instances a batch may run at once, album browsers and grid resolvers together
+    MAX_BROWSERS = 8
+    
     def __init__(self, root):
         self.root = root
         self.root.title("FB Album Scraper - Multi-Album Persistent Browser Edition")
@@ -817,14 +2513,20 @@ class FacebookScraperGUI:
         self.setup_styles()
         
         self.scraper = None
+        self.scrapers = []
         self.scraping_thread = None
         self.is_scraping = False
         self.album_logs = {}
+        self.log_files = {}
+        self.log_queue = queue.Queue()
+        self.pending_progress = None
         
         self.show_warning_popup()
         
         self.setup_gui()
         self.animate_startup()
+        self.root.after(self.LOG_DRAIN_INTERVAL_MS, self.drain_log_queue)
+        self.root.after(self.PROGRESS_REFRESH_MS, self.refresh_progress)
         
     def setup_styles(self):
         style = ttk.Style()
@@ -998,6 +2700,45 @@ class FacebookScraperGUI:
                                font=('Segoe UI', 8), relief='flat')
             btn.pack(side='left', padx=(0, 10))
         
+        workers_frame = tk.Frame(settings_row, bg='#1a1a1a')
+        workers_frame.pack(side='left', padx=(10, 0))
+        
+        tk.Label(workers_frame, text="Download Workers:", 
+                bg='#1a1a1a', fg='#ffffff', 
+                font=('Segoe UI', 9, 'bold')).pack(anchor='w')
+        
+        self.workers_var = tk.IntVar(value=4)
+        workers_spin = tk.Spinbox(workers_frame, from_=1, to=16, textvariable=self.workers_var,
+                                width=5, bg='#2a2a2a', fg='#ffffff', insertbackground='#FF1493',
+                                buttonbackground='#2a2a2a', font=('Segoe UI', 9), relief='flat')
+        workers_spin.pack(anchor='w', pady=(3, 0), ipady=2)
+        
+        albums_frame = tk.Frame(settings_row, bg='#1a1a1a')
+        albums_frame.pack(side='left', padx=(10, 0))
+        
+        tk.Label(albums_frame, text="Parallel Albums:", 
+                bg='#1a1a1a', fg='#ffffff', 
+                font=('Segoe UI', 9, 'bold')).pack(anchor='w')
+        
+        self.parallel_albums_var = tk.IntVar(value=1)
+        albums_spin = tk.Spinbox(albums_frame, from_=1, to=4, textvariable=self.parallel_albums_var,
+                               width=5, bg='#2a2a2a', fg='#ffffff', insertbackground='#FF1493',
+                               buttonbackground='#2a2a2a', font=('Segoe UI', 9), relief='flat')
+        albums_spin.pack(anchor='w', pady=(3, 0), ipady=2)
+        
+        resolvers_frame = tk.Frame(settings_row, bg='#1a1a1a')
+        resolvers_frame.pack(side='left', padx=(10, 0))
+        
+        tk.Label(resolvers_frame, text="Resolver Browsers:", 
+                bg='#1a1a1a', fg='#ffffff', 
+                font=('Segoe UI', 9, 'bold')).pack(anchor='w')
+        
+        self.resolver_workers_var = tk.IntVar(value=2)
+        resolvers_spin = tk.Spinbox(resolvers_frame, from_=1, to=8, textvariable=self.resolver_workers_var,
+                                  width=5, bg='#2a2a2a', fg='#ffffff', insertbackground='#FF1493',
+                                  buttonbackground='#2a2a2a', font=('Segoe UI', 9), relief='flat')
+        resolvers_spin.pack(anchor='w', pady=(3, 0), ipady=2)
+        
         options_frame = tk.Frame(settings_content, bg='#1a1a1a')
         options_frame.pack(fill='x')
         
@@ -1007,6 +2748,41 @@ class FacebookScraperGUI:
                                       selectcolor='#FF1493', activebackground='#1a1a1a',
                                       font=('Segoe UI', 9), relief='flat')
         headless_check.pack(anchor='w')
+        
+        self.remember_login_var = tk.BooleanVar()
+        remember_check = tk.Checkbutton(options_frame, text="Remember login between runs",
+                                      variable=self.remember_login_var, bg='#1a1a1a', fg='#ffffff',
+                                      selectcolor='#FF1493', activebackground='#1a1a1a',
+                                      font=('Segoe UI', 9), relief='flat')
+        remember_check.pack(anchor='w')
+        
+        self.network_capture_var = tk.BooleanVar()
+        network_check = tk.Checkbutton(options_frame, text="Capture media URLs from browser network log",
+                                     variable=self.network_capture_var, bg='#1a1a1a', fg='#ffffff',
+                                     selectcolor='#FF1493', activebackground='#1a1a1a',
+                                     font=('Segoe UI', 9), relief='flat')
+        network_check.pack(anchor='w')
+        
+        self.reuse_bytes_var = tk.BooleanVar()
+        reuse_check = tk.Checkbutton(options_frame, text="Save photos straight from the browser (less bandwidth)",
+                                   variable=self.reuse_bytes_var, bg='#1a1a1a', fg='#ffffff',
+                                   selectcolor='#FF1493', activebackground='#1a1a1a',
+                                   font=('Segoe UI', 9), relief='flat')
+        reuse_check.pack(anchor='w')
+        
+        self.sync_var = tk.BooleanVar()
+        sync_check = tk.Checkbutton(options_frame, text="Sync: only fetch media added since the last run",
+                                  variable=self.sync_var, bg='#1a1a1a', fg='#ffffff',
+                                  selectcolor='#FF1493', activebackground='#1a1a1a',
+                                  font=('Segoe UI', 9), relief='flat')
+        sync_check.pack(anchor='w')
+        
+        self.grid_harvest_var = tk.BooleanVar()
+        grid_check = tk.Checkbutton(options_frame, text="Grid harvest: collect links from the album grid (uses Resolver Browsers)",
+                                  variable=self.grid_harvest_var, bg='#1a1a1a', fg='#ffffff',
+                                  selectcolor='#FF1493', activebackground='#1a1a1a',
+                                  font=('Segoe UI', 9), relief='flat')
+        grid_check.pack(anchor='w')
     
     def setup_buttons(self, parent):
         button_frame = tk.Frame(parent, bg='#0a0a0a')
@@ -1139,60 +2915,101 @@ class FacebookScraperGUI:
         )
         return file_path
     
-    def log_message(self, message, level):
-        self.log_text.config(state='normal')
-        self.log_text.insert(tk.END, f"{message}\n", level)
-        self.log_text.see(tk.END)
-        self.log_text.config(state='disabled')
-        self.root.update_idletasks()
-        
-        album_id = self.current_album_id if hasattr(self, 'current_album_id') else "Combined"
-        if album_id not in self.album_logs:
-            self.album_logs[album_id] = []
-        self.album_logs[album_id].append((message, level))
-        
-        self.album_selector['values'] = list(self.album_logs.keys())
-        if not self.album_selector.get():
-            self.album_selector.set("Combined")
+    def log_message(self, message, level, album_id=None):
+        if album_id is None:
+            album_id = self.current_album_id if hasattr(self, 'current_album_id') else "Combined"
+        self.log_queue.put((album_id, message, level, True))
     
-    def combined_log_message(self, message, level):
-        album_id = self.current_album_id if hasattr(self, 'current_album_id') else "Unknown"
-        combined_message = f"[Album {album_id}] {message}"
-        if "Combined" not in self.album_logs:
-            self.album_logs["Combined"] = []
-        self.album_logs["Combined"].append((combined_message, level))
-        
-        if self.album_selector.get() == "Combined":
+    def combined_log_message(self, message, level, album_id=None):
+        if album_id is None:
+            album_id = self.current_album_id if hasattr(self, 'current_album_id') else "Unknown"
+        self.log_queue.put(("Combined", f"[Album {album_id}] {message}", level, False))
+    
+    def drain_log_queue(self):
+        deadline = time.monotonic() + self.LOG_DRAIN_BUDGET
+        inserts = []
+        spilled = {}
+        new_album = False
+        while time.monotonic() < deadline:
+            try:
+                album_id, message, level, always_shown = self.log_queue.get_nowait()
+            except queue.Empty:
+                break
+            if album_id not in self.album_logs:
+                self.album_logs[album_id] = deque(maxlen=self.LOG_RETENTION)
+                new_album = True
+            self.album_logs[album_id].append((message, level))
+            if album_id != "Combined":
+                spilled.setdefault(album_id, []).append(message)
+            if always_shown or self.album_selector.get() == "Combined":
+                inserts.extend((f"{message}\n", level))
+        
+        for album_id, lines in spilled.items():
+            try:
+                self.get_log_file(album_id).write_lines(lines)
+            except OSError:
+                pass
+        if inserts:
+            # One insert call for the whole batch instead of a widget round trip per line
             self.log_text.config(state='normal')
-            self.log_text.insert(tk.END, f"{combined_message}\n", level)
+            self.log_text.insert(tk.END, *inserts)
+            self.trim_log_view()
             self.log_text.see(tk.END)
             self.log_text.config(state='disabled')
-            self.root.update_idletasks()
-        
-        self.album_selector['values'] = list(self.album_logs.keys())
-        if not self.album_selector.get():
-            self.album_selector.set("Combined")
+        if new_album:
+            self.album_selector['values'] = list(self.album_logs.keys())
+            if not self.album_selector.get():
+                self.album_selector.set("Combined")
+        self.root.after(self.LOG_DRAIN_INTERVAL_MS, self.drain_log_queue)
+    
+    def get_log_file(self, album_id):
+        if album_id not in self.log_files:
+            file_name = self.remove_invalid_characters(f"album_{album_id}") + ".log"
+            self.log_files[album_id] = RotatingLogFile(os.path.join(self.LOG_DIR, file_name))
+        return self.log_files[album_id]
+    
+    def trim_log_view(self):
+        # Every line ends with a newline, so the last index sits on an empty extra line
+        line_count = int(self.log_text.index('end-1c').split('.')[0]) - 1
+        if line_count > self.LOG_VIEW_LINES:
+            self.log_text.delete('1.0', f"{line_count - self.LOG_VIEW_LINES + 1}.0")
     
     def switch_log(self, event):
+        # Only the visible tail is rendered, so switching costs the same however long the run has been
         selected_album = self.album_selector.get()
+        history = self.album_logs.get(selected_album, ())
+        inserts = []
+        for message, level in islice(history, max(0, len(history) - self.LOG_VIEW_LINES), None):
+            inserts.extend((f"{message}\n", level))
         self.log_text.config(state='normal')
         self.log_text.delete(1.0, tk.END)
-        for message, level in self.album_logs.get(selected_album, []):
-            self.log_text.insert(tk.END, f"{message}\n", level)
+        if inserts:
+            self.log_text.insert(tk.END, *inserts)
         self.log_text.see(tk.END)
         self.log_text.config(state='disabled')
     
     def update_progress(self, current, total, message=""):
-        if total > 0:
-            progress = (current / total) * 100
-            self.progress_bar.set_progress(progress)
-        
-        if message:
-            self.progress_var.set(f"{message} ({current}/{total})")
-        else:
-            self.progress_var.set(f"Progress: {current}/{total}")
-        
-        self.root.update_idletasks()
+        # Only the latest report matters, so workers just replace it and the Tk loop picks it up
+        self.pending_progress = (current, total, message)
+    
+    def refresh_progress(self):
+        pending, self.pending_progress = self.pending_progress, None
+        if pending:
+            current, total, message = pending
+            if total > 0:
+                progress = (current / total) * 100
+                self.progress_bar.set_progress(progress)
+            
+            if message:
+                self.progress_var.set(f"{message} ({current}/{total})")
+            else:
+                self.progress_var.set(f"Progress: {current}/{total}")
+        self.root.after(self.PROGRESS_REFRESH_MS, self.refresh_progress)
+    
+    def close_log_files(self):
+        for log_file in self.log_files.values():
+            log_file.close()
+        self.log_files.clear()
     
     def clear_log(self):
         self.album_logs.clear()
@@ -1202,6 +3019,58 @@ class FacebookScraperGUI:
         self.log_text.delete(1.0, tk.END)
         self.log_message("📋 Log cleared - Ready for new session", "INFO")
     
+    def get_download_workers(self):
+        try:
+            return max(1, min(16, int(self.workers_var.get())))
+        except (tk.TclError, ValueError):
+            return 4
+    
+    def get_parallel_albums(self):
+        try:
+            return max(1, min(4, int(self.parallel_albums_var.get())))
+        except (tk.TclError, ValueError):
+            return 1
+    
+    def get_resolver_workers(self):
+        try:
+            return max(1, min(8, int(self.resolver_workers_var.get())))
+        except (tk.TclError, ValueError):
+            return 2
+    
+    def create_scraper(self, album_channel=None, worker_index=0, **kwargs):
+        # Each album channel routes its scraper's log lines to that album's entry in album_logs
+        if album_channel is None:
+            log_callback = self.log_message
+            combined_log_callback = self.combined_log_message
+        else:
+            log_callback = lambda message, level: self.log_message(message, level, album_channel.get("album_id"))
+            combined_log_callback = lambda message, level: self.combined_log_message(message, level, album_channel.get("album_id"))
+        if self.remember_login_var.get():
+            # Chrome locks a profile directory, so each parallel browser gets its own
+            profile_root = os.path.join(os.path.expanduser("~"), ".fb_album_scraper")
+            kwargs.setdefault('profile_dir', os.path.join(profile_root, f"profile_{worker_index}"))
+            kwargs.setdefault('cookie_file', os.path.join(profile_root, "cookies.json"))
+        return FacebookAlbumScraper(
+            headless=self.headless_var.get(),
+            debug_port=9222 + worker_index,
+            capture_mode="network" if self.network_capture_var.get() else "dom",
+            reuse_browser_bytes=self.reuse_bytes_var.get(),
+            collection_mode="grid" if self.grid_harvest_var.get() else "viewer",
+            resolver_workers=self.get_resolver_workers(),
+            progress_callback=self.update_progress,
+            log_callback=log_callback,
+            combined_log_callback=combined_log_callback,
+            speed=self.speed_var.get(),
+            download_workers=self.get_download_workers(),
+            **kwargs
+        )
+    
+    def active_scrapers(self):
+        scrapers = list(self.scrapers)
+        if self.scraper and self.scraper not in scrapers:
+            scrapers.append(self.scraper)
+        return scrapers
+    
     def validate_inputs(self, require_url=True):
         url = self.url_var.get().strip()
         folder = self.folder_var.get().strip()
@@ -1343,8 +3212,10 @@ class FacebookScraperGUI:
         self.scraping_thread.start()
     
     def stop_scraping(self):
-        if self.scraper:
-            self.scraper.stop_scraping()
+        scrapers = self.active_scrapers()
+        for scraper in scrapers:
+            scraper.stop_scraping()
+        if scrapers:
             self.log_message("⏹️ Stop signal sent...", "INFO")
     
     def set_scraping_state(self, is_scraping):
@@ -1368,34 +3239,68 @@ class FacebookScraperGUI:
             self.website_button.config_state("normal")
             self.progress_var.set("Ready for next mission...")
     
+    def run_album_batch(self, urls, process_album, stopped_message):
+        total_albums = len(urls)
+        parallel = min(self.get_parallel_albums(), total_albums)
+        url_queue = queue.Queue()
+        for i, url in enumerate(urls, 1):
+            url_queue.put((i, url))
+        
+        # Every browser in the batch shares one login, one set of download caps and one browser limit
+        shared_login = SharedLogin() if parallel > 1 else None
+        download_limiter = None
+        browser_limit = BrowserLimit(max(self.MAX_BROWSERS, parallel))
+        workers = []
+        for worker_index in range(parallel):
+            channel = {"album_id": None}
+            scraper = self.create_scraper(channel, worker_index, download_limiter=download_limiter,
+                                          shared_login=shared_login, browser_limit=browser_limit)
+            download_limiter = scraper.download_limiter
+            workers.append((scraper, channel))
+        self.scrapers = [scraper for scraper, _ in workers]
+        
+        def run_worker(scraper, channel):
+            try:
+                while True:
+                    if not self.is_scraping or scraper.stop_requested:
+                        self.log_message(stopped_message, "WARNING", channel["album_id"])
+                        return
+                    try:
+                        i, url = url_queue.get_nowait()
+                    except queue.Empty:
+                        return
+                    channel["album_id"] = parse_qs(urlparse(url).query).get('set', [''])[0]
+                    process_album(scraper, channel["album_id"], i, total_albums, url)
+            finally:
+                scraper.close()
+        
+        if parallel > 1:
+            self.log_message(f"Processing {total_albums} albums with {parallel} browsers in parallel", "INFO")
+        try:
+            with ThreadPoolExecutor(max_workers=parallel) as executor:
+                futures = [executor.submit(run_worker, scraper, channel) for scraper, channel in workers]
+                for future in futures:
+                    future.result()
+        finally:
+            self.scrapers = []
+    
     def run_multi_scraping(self, urls):
+        def scrape(scraper, album_id, i, total_albums, url):
+            self.log_message(f"📔 Starting album {i}/{total_albums}: {url}", "INFO", album_id)
+            
+            folder = self.folder_var.get().strip()
+            
+            success = scraper.scrape_album(url, folder, sync=self.sync_var.get())
+            
+            if success:
+                self.log_message(f"✅ Album {i}/{total_albums} completed successfully! 🎉", "SUCCESS", album_id)
+            else:
+                self.log_message(f"❌ Album {i}/{total_albums} failed. Check logs for details.", "ERROR", album_id)
+        
         try:
             total_albums = len(urls)
-            self.scraper = FacebookAlbumScraper(
-                headless=self.headless_var.get(),
-                progress_callback=self.update_progress,
-                log_callback=self.log_message,
-                combined_log_callback=self.combined_log_message,
-                speed=self.speed_var.get()
-            )
+            self.run_album_batch(urls, scrape, "⏹️ Scraping stopped by user")
             
-            for i, url in enumerate(urls, 1):
-                if self.is_scraping == False:
-                    self.log_message("⏹️ Scraping stopped by user", "WARNING")
-                    break
-                
-                self.current_album_id = parse_qs(urlparse(url).query).get('set', [''])[0]
-                self.log_message(f"📔 Starting album {i}/{total_albums}: {url}", "INFO")
-                
-                folder = self.folder_var.get().strip()
-                
-                success = self.scraper.scrape_album(url, folder)
-                
-                if success:
-                    self.log_message(f"✅ Album {i}/{total_albums} completed successfully! 🎉", "SUCCESS")
-                else:
-                    self.log_message(f"❌ Album {i}/{total_albums} failed. Check logs for details.", "ERROR")
-                
             if self.is_scraping:
                 self.log_message(f"✅ Multi-album scraping completed! Processed {total_albums} albums.", "SUCCESS")
                 messagebox.showinfo("🎉 Success!", f"Multi-album scraping completed!\n\nProcessed {total_albums} albums.\n\nYou're awesome! 🌟")
@@ -1404,40 +3309,26 @@ class FacebookScraperGUI:
             self.log_message(f"💥 Unexpected error: {e}", "ERROR")
             messagebox.showerror("💥 System Error", f"Unexpected error occurred:\n{e}")
         finally:
-            if self.scraper:
-                self.scraper.close()
-                self.scraper = None
             self.set_scraping_state(False)
     
     def run_multi_grab_links(self, urls):
+        def grab(scraper, album_id, i, total_albums, url):
+            self.log_message(f"📔 Starting link collection for album {i}/{total_albums}: {url}", "INFO", album_id)
+            
+            folder = self.folder_var.get().strip()
+            album_title = self.remove_invalid_characters(f"Album_{album_id}")
+            
+            success = scraper.grab_links_only(url, folder, album_title, sync=self.sync_var.get())
+            
+            if success:
+                self.log_message(f"✅ Album {i}/{total_albums} links collected successfully! 🔗", "SUCCESS", album_id)
+            else:
+                self.log_message(f"❌ Album {i}/{total_albums} link collection failed. Check logs for details.", "ERROR", album_id)
+        
         try:
             total_albums = len(urls)
-            self.scraper = FacebookAlbumScraper(
-                headless=self.headless_var.get(),
-                progress_callback=self.update_progress,
-                log_callback=self.log_message,
-                combined_log_callback=self.combined_log_message,
-                speed=self.speed_var.get()
-            )
+            self.run_album_batch(urls, grab, "⏹️ Link collection stopped by user")
             
-            for i, url in enumerate(urls, 1):
-                if self.is_scraping == False:
-                    self.log_message("⏹️ Link collection stopped by user", "WARNING")
-                    break
-                
-                self.current_album_id = parse_qs(urlparse(url).query).get('set', [''])[0]
-                self.log_message(f"📔 Starting link collection for album {i}/{total_albums}: {url}", "INFO")
-                
-                folder = self.folder_var.get().strip()
-                album_title = self.remove_invalid_characters(f"Album_{self.current_album_id}")
-                
-                success = self.scraper.grab_links_only(url, folder, album_title)
-                
-                if success:
-                    self.log_message(f"✅ Album {i}/{total_albums} links collected successfully! 🔗", "SUCCESS")
-                else:
-                    self.log_message(f"❌ Album {i}/{total_albums} link collection failed. Check logs for details.", "ERROR")
-                
             if self.is_scraping:
                 self.log_message(f"✅ Multi-album link collection completed! Processed {total_albums} albums.", "SUCCESS")
                 messagebox.showinfo("🔗 Links Collected!", f"Links for {total_albums} albums successfully saved!\n\nReady for download! 📥")
@@ -1446,20 +3337,11 @@ class FacebookScraperGUI:
             self.log_message(f"💥 Unexpected error: {e}", "ERROR")
             messagebox.showerror("💥 System Error", f"Unexpected error occurred:\n{e}")
         finally:
-            if self.scraper:
-                self.scraper.close()
-                self.scraper = None
             self.set_scraping_state(False)
     
     def run_resume_grab_links(self, json_file_path):
         try:
-            self.scraper = FacebookAlbumScraper(
-                headless=self.headless_var.get(),
-                progress_callback=self.update_progress,
-                log_callback=self.log_message,
-                combined_log_callback=self.combined_log_message,
-                speed=self.speed_var.get()
-            )
+            self.scraper = self.create_scraper()
             
             url = self.url_var.get().strip()
             self.current_album_id = parse_qs(urlparse(url).query).get('set', [''])[0]
@@ -1484,13 +3366,7 @@ class FacebookScraperGUI:
     
     def run_download_from_json(self, json_file_path):
         try:
-            self.scraper = FacebookAlbumScraper(
-                headless=self.headless_var.get(),
-                progress_callback=self.update_progress,
-                log_callback=self.log_message,
-                combined_log_callback=self.combined_log_message,
-                speed=self.speed_var.get()
-            )
+            self.scraper = self.create_scraper()
             
             folder = self.folder_var.get().strip()
             self.current_album_id = os.path.basename(os.path.dirname(json_file_path))
@@ -1529,14 +3405,99 @@ class FacebookScraperGUI:
                                        "Do you want to abort and exit?\n"
                                        "⚠️ Progress may be lost!")
             if result:
-                if self.scraper:
-                    self.scraper.stop_scraping()
+                for scraper in self.active_scrapers():
+                    scraper.stop_scraping()
+                self.close_log_files()
                 self.root.destroy()
         else:
             self.title_label.config(text="GOODBYE! 👋", fg="#FF69B4")
+            self.close_log_files()
             self.root.after(500, self.root.destroy)
 
+def run_cli(argv):
+    parser = argparse.ArgumentParser(
+        description="Collect and download Facebook album media without the GUI. "
+                    "Progress and log lines are printed to stdout as JSON, one event per line.")
+    parser.add_argument("--folder", default="downloaded_albums", help="Main download folder")
+    parser.add_argument("--speed", choices=["Slow", "Medium", "Fast"], default="Medium")
+    parser.add_argument("--workers", type=int, default=4, help="Download workers")
+    parser.add_argument("--max-rps", type=float, default=None, help="Request rate cap (defaults to the speed profile)")
+    parser.add_argument("--headless", action="store_true", help="Hide the browser window")
+    parser.add_argument("--remember-login", action="store_true", help="Keep the browser profile and login cookies")
+    parser.add_argument("--network-capture", action="store_true", help="Capture media URLs from the browser network log")
+    parser.add_argument("--grid", action="store_true", help="Collect links from the album grid")
+    parser.add_argument("--resolvers", type=int, default=2, help="Browser sessions resolving grid links")
+    parser.add_argument("--sync", action="store_true", help="Only fetch media added since the last run")
+    parser.add_argument("--metrics-file", default=None, help="Keep live run metrics in this JSON file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    scrape_parser = subparsers.add_parser("scrape", help="Collect links and download one or more albums")
+    scrape_parser.add_argument("urls", nargs="+")
+    grab_parser = subparsers.add_parser("grab", help="Collect links for one or more albums without downloading")
+    grab_parser.add_argument("urls", nargs="+")
+    resume_parser = subparsers.add_parser("resume", help="Continue collecting links into an existing JSON file")
+    resume_parser.add_argument("url")
+    resume_parser.add_argument("json_file")
+    download_parser = subparsers.add_parser("download", help="Download media from one or more saved JSON files")
+    download_parser.add_argument("json_files", nargs="+")
+    args = parser.parse_args(argv)
+    
+    output_lock = threading.Lock()
+    
+    def emit(event, **fields):
+        with output_lock:
+            print(json.dumps(dict(event=event, time=round(time.time(), 3), **fields)), flush=True)
+    
+    scraper_options = {}
+    if args.remember_login:
+        profile_root = os.path.join(os.path.expanduser("~"), ".fb_album_scraper")
+        scraper_options = {'profile_dir': os.path.join(profile_root, "profile_0"),
+                           'cookie_file': os.path.join(profile_root, "cookies.json")}
+    scraper = FacebookAlbumScraper(
+        headless=args.headless,
+        progress_callback=lambda current, total, message: emit("progress", current=current, total=total, message=message),
+        log_callback=lambda message, level: emit("log", level=level, message=message),
+        speed=args.speed,
+        download_workers=args.workers,
+        max_rps=args.max_rps,
+        capture_mode="network" if args.network_capture else "dom",
+        collection_mode="grid" if args.grid else "viewer",
+        resolver_workers=args.resolvers,
+        metrics_file=args.metrics_file,
+        **scraper_options
+    )
+    
+    if args.command == "scrape":
+        jobs = [(url, lambda url=url: scraper.scrape_album(url, args.folder, sync=args.sync)) for url in args.urls]
+    elif args.command == "grab":
+        jobs = []
+        for url in args.urls:
+            album_id = parse_qs(urlparse(url).query).get('set', [''])[0]
+            album_title = scraper.remove_invalid_characters(f"Album_{album_id}")
+            jobs.append((url, lambda url=url, album_title=album_title: scraper.grab_links_only(url, args.folder, album_title, sync=args.sync)))
+    elif args.command == "resume":
+        jobs = [(args.url, lambda: scraper.resume_grab_links(args.url, args.json_file))]
+    else:
+        jobs = [(path, lambda path=path: scraper.download_from_json(path, args.folder)) for path in args.json_files]
+    
+    failures = 0
+    try:
+        for i, (target, job) in enumerate(jobs, 1):
+            emit("album_started", index=i, total=len(jobs), target=target)
+            success = job()
+            failures += 0 if success else 1
+            emit("album_finished", index=i, total=len(jobs), target=target, success=bool(success))
+            if scraper.stop_requested:
+                break
+    except KeyboardInterrupt:
+        scraper.stop_scraping()
+        failures += 1
+    finally:
+        scraper.close()
+    return 1 if failures else 0
+
 def main():
+    load_gui()
     root = tk.Tk()
     
     try:
@@ -1560,4 +3521,6 @@ def main():
     root.mainloop()
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(run_cli(sys.argv[1:]))
     main()
\ No newline at end of file
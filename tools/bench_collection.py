@@ -0,0 +1,217 @@
+"""
+Collection-side benchmarks with fake WebDriver objects standing in for the Facebook photo viewer.
+
+    python tools/bench_collection.py [--baseline REVISION]
+
+  calls      WebDriver protocol calls per collected item
+  index      duplicate checks: set-backed CollectedMediaIndex vs scanning the collected list
+  journal    bytes written to disk while collecting: rewriting media_urls.json per item vs the journal
+  latency    time to step through viewers that take 0.05-1.2s to show the next photo
+  recovery   keys sent and page loads when the viewer stalls deep into an album
+
+REVISION is any git revision of the script to compare against, such as a tag or the commit before a change;
+the viewer benchmarks then run on it as well as on the working tree.
+"""
+
+import os
+import sys
+import json
+import time
+import types
+import random
+import argparse
+import tempfile
+from urllib.parse import urlparse, parse_qs
+
+from support import load_scraper_module, no_delays, quiet
+
+ALBUM_URL = "https://www.facebook.com/media/set/?set=a.1"
+
+class FakeElement:
+    # Every element method call counts as one WebDriver round trip on its driver
+    def __init__(self, driver):
+        self.driver = driver
+
+    def get_attribute(self, name):
+        self.driver.calls += 1
+        return {'src': self.driver.media_state()['src'], 'width': '500', 'height': '500', 'href': ALBUM_URL}.get(name)
+
+    def is_displayed(self):
+        self.driver.calls += 1
+        return True
+
+    def send_keys(self, *keys):
+        self.driver.calls += 1
+        self.driver.next_media()
+
+    def find_element(self, *args):
+        self.driver.calls += 1
+        return FakeElement(self.driver)
+
+    def find_elements(self, *args):
+        self.driver.calls += 1
+        return [FakeElement(self.driver)]
+
+class FakeViewerDriver:
+    # A photo viewer over `items` photos; subclasses change how the next-photo key behaves
+    def __init__(self, items):
+        self.items = items
+        self.calls = 0
+        self.position = 0
+        self.loads = 0
+        self.keys = 0
+
+    def shown(self):
+        return self.position
+
+    def next_media(self):
+        self.keys += 1
+        self.position += 1
+
+    def media_state(self):
+        index = self.shown()
+        return {'mediaType': 'image', 'src': f"https://scontent.x/{index}.jpg" if index < self.items else None,
+                'permalink': f"https://www.facebook.com/photo/?fbid={index}&set=a.1", 'hasMedia': index < self.items}
+
+    @property
+    def current_url(self):
+        self.calls += 1
+        return self.media_state()['permalink']
+
+    def find_element(self, by, selector):
+        self.calls += 1
+        return FakeElement(self)
+
+    def find_elements(self, by, selector):
+        self.calls += 1
+        return [FakeElement(self)] if self.shown() < self.items else []
+
+    def execute_script(self, script, *args):
+        self.calls += 1
+        if 'permalink' in script:
+            return self.media_state()
+        # Anything else is the click on the first photo, which opens the viewer at the start of the album
+        self.position = 0
+        self.loads += 1
+        return ALBUM_URL
+
+    def get(self, url):
+        self.calls += 1
+        self.loads += 1
+        fbid = parse_qs(urlparse(url).query).get('fbid')
+        self.position = int(fbid[0]) if fbid else 0
+
+    def refresh(self):
+        self.calls += 1
+
+class SlowViewerDriver(FakeViewerDriver):
+    # The next photo only shows up after a random delay, like a viewer waiting on the network
+    def __init__(self, items, seed=1):
+        super().__init__(items)
+        self.switch_at = 0
+        self.rng = random.Random(seed)
+
+    def shown(self):
+        return self.position if time.monotonic() >= self.switch_at else self.position - 1
+
+    def next_media(self):
+        super().next_media()
+        self.switch_at = time.monotonic() + self.rng.choice([0.05, 0.1, 0.15, 0.2, 0.3, 1.2])
+
+class StallingDriver(FakeViewerDriver):
+    # The viewer ignores the next-photo key for a while at stall_at, so stuck recovery has to kick in
+    def __init__(self, items, stall_at, stalls=12):
+        super().__init__(items)
+        self.stall_at = stall_at
+        self.stalls_left = stalls
+
+    def next_media(self):
+        if self.position == self.stall_at and self.stalls_left > 0:
+            self.keys += 1
+            self.stalls_left -= 1
+            return
+        super().next_media()
+
+def new_scraper(module, **kwargs):
+    scraper = module.FacebookAlbumScraper(log_callback=quiet, **kwargs)
+    if hasattr(scraper, 'navigation_timeout'):
+        scraper.navigation_timeout = 0.01
+    return scraper
+
+def bench_calls(name, module, items):
+    real_time = module.time
+    module.time = types.SimpleNamespace(sleep=lambda seconds: None, time=real_time.time, monotonic=real_time.monotonic)
+    try:
+        scraper = new_scraper(module)
+        scraper.driver = FakeViewerDriver(items)
+        urls = scraper.collect_media_urls(ALBUM_URL, items)
+    finally:
+        module.time = real_time
+    print(f"calls      {name}: {len(urls)} items, {scraper.driver.calls / max(1, len(urls)):.2f} calls per item")
+
+def bench_latency(name, module, items):
+    scraper = module.FacebookAlbumScraper(speed="Medium", log_callback=quiet)
+    scraper.driver = SlowViewerDriver(items)
+    start = time.monotonic()
+    urls = scraper.collect_media_urls(ALBUM_URL, items)
+    print(f"latency    {name}: {len(urls)} items in {time.monotonic() - start:.1f}s")
+
+def bench_recovery(name, module, items):
+    scraper = no_delays(new_scraper(module))
+    scraper.driver = StallingDriver(items, stall_at=items * 5 // 6)
+    urls = scraper.collect_media_urls(ALBUM_URL, items)
+    print(f"recovery   {name}: {len(urls)} items, {scraper.driver.keys} keys, {scraper.driver.loads} page loads")
+
+def bench_index(module, sizes=(10000, 50000)):
+    for size in sizes:
+        entries = [(f"https://scontent/x{i}.jpg", 'image', f"https://fb/photo/?fbid={i}") for i in range(size)]
+        start = time.monotonic()
+        index = module.CollectedMediaIndex()
+        for entry in entries:
+            index.add(*entry)
+        indexed = time.monotonic() - start
+        # Scanning the list for every new item is quadratic; time a sample and extrapolate
+        sample = entries[-200:]
+        start = time.monotonic()
+        for media_url, _, original_url in sample:
+            any(media_url == u or original_url == o for u, _, o in entries)
+        scanned = (time.monotonic() - start) / len(sample) * size / 2
+        print(f"index      {size} items: index {indexed:.3f}s, list scan {scanned:.1f}s (estimated)")
+
+def bench_journal(module, folder, items=5000):
+    file_path = os.path.join(folder, "journal", "media_urls.json")
+    entries = [(f"https://scontent.xx.fbcdn.net/v/t39/{i:08d}_n.jpg?oe=6700AAAA&_nc_sid=abc", 'image',
+                f"https://www.facebook.com/photo/?fbid={i}&set=a.1") for i in range(items)]
+    rewritten = sum(len(json.dumps(entries[:n])) for n in range(1, items + 1))
+    scraper = module.FacebookAlbumScraper(log_callback=quiet)
+    urls = []
+    for entry in entries:
+        urls.append(entry)
+        scraper.append_url_to_journal(urls, file_path)
+    scraper.save_urls_to_file(urls, file_path)
+    scraper.close()
+    journaled = sum(len(json.dumps([i] + list(entry))) + 1 for i, entry in enumerate(entries)) + os.path.getsize(file_path)
+    print(f"journal    {items} items: rewrite per item {rewritten / 1e6:.1f} MB, journal {journaled / 1e6:.2f} MB")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Collection-side benchmarks with fake WebDriver objects")
+    parser.add_argument('--baseline', help="Git revision of the script to compare against")
+    parser.add_argument('--items', type=int, default=200, help="Photos in the fake album")
+    args = parser.parse_args(argv)
+    modules = [("current", load_scraper_module())]
+    if args.baseline:
+        modules.insert(0, (args.baseline, load_scraper_module(args.baseline, name="fb_album_baseline")))
+    for name, module in modules:
+        bench_calls(name, module, args.items)
+    for name, module in modules:
+        bench_latency(name, module, 40)
+    for name, module in modules:
+        bench_recovery(name, module, args.items)
+    current = modules[-1][1]
+    bench_index(current)
+    with tempfile.TemporaryDirectory() as folder:
+        bench_journal(current, folder)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Download-side benchmarks against a local HTTP stand-in and synthetic album folders.
+
+    python tools/bench_downloads.py [--only NAME] [options, see --help]
+
+  workers      album download time with 1 worker vs the pool (each request waits --latency seconds)
+  connections  TCP connections and CPU for 20 large files: bare requests.get with 1 KB chunks vs the pooled session
+  stream       peak memory and time to the first entry: json.load vs MediaUrlStream on a large media_urls.json
+  resume       resume planning with one directory scan vs an os.path.exists per item
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import resource
+import tracemalloc
+
+import requests
+
+from support import load_scraper_module, make_handler, start_server, quiet
+
+fb = load_scraper_module()
+
+def cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+def bench_workers(folder, items, latency):
+    server, base = start_server(make_handler(delay=latency))
+    media_urls = [(f"{base}{i}.jpg", 'image', f"https://fb/photo/?fbid={i}") for i in range(items)]
+    for workers in (1, 8):
+        scraper = fb.FacebookAlbumScraper(speed="Fast", download_workers=workers, max_rps=1000, log_callback=quiet)
+        scraper.delay_map[scraper.speed]["download"] = 0
+        start = time.monotonic()
+        saved = scraper.download_media(media_urls, folder, f"workers_{workers}")
+        print(f"workers      {workers} worker(s): {saved}/{items} files in {time.monotonic() - start:.2f}s")
+    server.shutdown()
+
+def bench_connections(folder):
+    handler = make_handler(body=b'x' * (4 << 20))
+    server, base = start_server(handler)
+    start = cpu_seconds()
+    for i in range(20):
+        response = requests.get(f"{base}{i}.mp4", stream=True)
+        with open(os.path.join(folder, "bare.mp4"), 'wb') as f:
+            for chunk in response.iter_content(1024):
+                f.write(chunk)
+    print(f"connections  requests.get, 1 KB chunks: {handler.connections} connections, {cpu_seconds() - start:.2f}s CPU")
+    handler.connections = 0
+    scraper = fb.FacebookAlbumScraper(download_workers=1, log_callback=quiet)
+    start = cpu_seconds()
+    for i in range(20):
+        scraper.download_media_from_url(f"{base}{i}.mp4", os.path.join(folder, "pooled", f"{i}.mp4"), 'video')
+    print(f"connections  pooled session: {handler.connections} connections, {cpu_seconds() - start:.2f}s CPU")
+    server.shutdown()
+
+def bench_stream(folder, entries):
+    file_path = os.path.join(folder, "stream", "media_urls.json")
+    os.makedirs(os.path.dirname(file_path))
+    with open(file_path, 'w') as f:
+        json.dump([(f"https://scontent.xx.fbcdn.net/v/t39/{i:08d}_n.jpg?oe=6700AAAA&_nc_sid=abc", 'image',
+                    f"https://www.facebook.com/photo/?fbid={i}&set=a.1") for i in range(entries)], f)
+    scraper = fb.FacebookAlbumScraper(log_callback=quiet)
+    tracemalloc.start()
+    start = time.monotonic()
+    with open(file_path) as f:
+        loaded = json.load(f)
+    first = time.monotonic() - start
+    print(f"stream       json.load: first entry after {first:.3f}s, peak {tracemalloc.get_traced_memory()[1] / 1e6:.1f} MB")
+    del loaded
+    tracemalloc.reset_peak()
+    start = time.monotonic()
+    iterator = iter(fb.MediaUrlStream(scraper, file_path))
+    next(iterator)
+    first = time.monotonic() - start
+    count = 1 + sum(1 for _ in iterator)
+    print(f"stream       MediaUrlStream: first entry after {first:.4f}s, {count} entries in {time.monotonic() - start:.2f}s, "
+          f"peak {tracemalloc.get_traced_memory()[1] / 1e6:.1f} MB")
+    tracemalloc.stop()
+
+def bench_resume(folder, entries):
+    album = os.path.join(folder, "resume")
+    os.makedirs(album)
+    gaps = {50, entries // 2, entries - 1}
+    for i in range(1, entries + 1):
+        if i not in gaps:
+            open(os.path.join(album, f"{i:03d}.jpg"), 'w').close()
+    media_urls = [(f"u{i}", 'image', f"p{i}") for i in range(entries)]
+    start = time.monotonic()
+    missing = [i for i in range(1, entries + 1) if not os.path.exists(os.path.join(album, f"{i:03d}.jpg"))]
+    print(f"resume       os.path.exists per item: {len(missing)} gaps in {time.monotonic() - start:.3f}s")
+    scraper = fb.FacebookAlbumScraper(log_callback=quiet)
+    start = time.monotonic()
+    resume_index, missing_count, _ = scraper.plan_resume(media_urls, album)
+    print(f"resume       plan_resume: {missing_count} gaps, resume at {resume_index + 1}, in {time.monotonic() - start:.3f}s")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Download-side benchmarks")
+    parser.add_argument('--items', type=int, default=60, help="Files per album in the workers benchmark")
+    parser.add_argument('--latency', type=float, default=0.05, help="Seconds the stand-in server waits per request")
+    parser.add_argument('--entries', type=int, default=200000, help="Entries in the large-album benchmarks")
+    parser.add_argument('--only', metavar='NAME', help="Run only the named benchmark")
+    args = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as folder:
+        if args.only in (None, 'workers'):
+            bench_workers(folder, args.items, args.latency)
+        if args.only in (None, 'connections'):
+            bench_connections(folder)
+        if args.only in (None, 'stream'):
+            bench_stream(folder, args.entries)
+        if args.only in (None, 'resume'):
+            bench_resume(folder, args.entries)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+Checks the chunked JSON array parser in MediaUrlStream.iter_snapshot against json.load.
+Entries are made to straddle chunk boundaries, and the journal tail and the running estimate are checked too.
+
+    python tools/check_media_stream.py
+"""
+
+import os
+import sys
+import json
+import tempfile
+
+from support import load_scraper_module, quiet
+
+fb = load_scraper_module()
+
+def sample_entries(count):
+    entries = []
+    for i in range(count):
+        # Varying lengths move entry boundaries around; escapes and brackets inside strings must not confuse the parser
+        media_url = f"https://scontent.xx.fbcdn.net/v/t39/{i}_n.jpg?oe=67{'a' * (i % 50)}&_nc=\"q\"[{i}]"
+        media_type = 'video' if i % 3 == 0 else 'image'
+        original_url = f"https://www.facebook.com/photo/?fbid={i}&set=a.1&title=été \\ {i}"
+        entries.append((media_url, media_type, original_url))
+    return entries
+
+def check_layouts(folder, entries):
+    file_path = os.path.join(folder, "media_urls.json")
+    scraper = fb.FacebookAlbumScraper(log_callback=quiet)
+    for indent in (None, 2):
+        with open(file_path, 'w') as f:
+            json.dump(entries, f, indent=indent)
+        expected = [tuple(entry) for entry in json.load(open(file_path))]
+        for chunk_size in (1, 7, 97, 4096, 64 * 1024):
+            parsed = list(fb.MediaUrlStream(scraper, file_path, chunk_size=chunk_size).iter_snapshot())
+            assert parsed == expected, (indent, chunk_size)
+
+def check_edge_cases(folder):
+    file_path = os.path.join(folder, "edge.json")
+    scraper = fb.FacebookAlbumScraper(log_callback=quiet)
+    for text, expected in (("[]", []), ("  [ ]  ", []), ("\n[\n]\n", []),
+                           ('[["a","image","b"]]', [("a", "image", "b")])):
+        with open(file_path, 'w') as f:
+            f.write(text)
+        assert list(fb.MediaUrlStream(scraper, file_path, chunk_size=2).iter_snapshot()) == expected, text
+    assert list(fb.MediaUrlStream(scraper, os.path.join(folder, "missing.json")).iter_snapshot()) == []
+    with open(file_path, 'w') as f:
+        f.write('{"not": "an array"}')
+    try:
+        list(fb.MediaUrlStream(scraper, file_path).iter_snapshot())
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("a JSON object was accepted as a media list")
+    with open(file_path, 'w') as f:
+        f.write('[["a","image","b"], ["c","ima')
+    try:
+        list(fb.MediaUrlStream(scraper, file_path, chunk_size=4).iter_snapshot())
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("a truncated file was read without an error")
+
+def check_journal_tail(folder, entries):
+    file_path = os.path.join(folder, "media_urls.json")
+    scraper = fb.FacebookAlbumScraper(log_callback=quiet)
+    scraper.save_urls_to_file([list(entry) for entry in entries], file_path)
+    # Entries collected after the last compaction live only in the journal
+    urls = [list(entry) for entry in entries] + [["https://scontent.x/new.jpg", "image", "https://fb/photo/new"]]
+    scraper.append_url_to_journal(urls, file_path)
+    scraper.close()
+    stream = fb.MediaUrlStream(scraper, file_path, chunk_size=97)
+    parsed = list(stream)
+    assert parsed[:-1] == entries and parsed[-1] == tuple(urls[-1])
+    assert stream.estimated_total() == len(urls)
+
+def check_estimate(folder, entries):
+    file_path = os.path.join(folder, "estimate.json")
+    with open(file_path, 'w') as f:
+        json.dump(entries, f)
+    stream = fb.MediaUrlStream(fb.FacebookAlbumScraper(log_callback=quiet), file_path, chunk_size=4096)
+    iterator = iter(stream)
+    for _ in range(len(entries) // 10):
+        next(iterator)
+    estimate = stream.estimated_total()
+    assert abs(estimate - len(entries)) < len(entries) * 0.2, estimate
+
+def main():
+    entries = sample_entries(3000)
+    with tempfile.TemporaryDirectory() as folder:
+        checks = [
+            ("matches json.load across chunk sizes", lambda: check_layouts(folder, entries)),
+            ("empty, tiny, missing and malformed files", lambda: check_edge_cases(folder)),
+            ("journal tail follows the snapshot", lambda: check_journal_tail(folder, entries)),
+            ("running estimate of the total", lambda: check_estimate(folder, entries)),
+        ]
+        for name, check in checks:
+            check()
+            print(f"ok  {name}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Checks interrupted downloads against a local HTTP stand-in that drops connections mid-body.
+Covers Range/If-Range resumption, servers that refuse the range, changed files and gzip-encoded bodies.
+
+    python tools/check_resume.py
+"""
+
+import os
+import sys
+import tempfile
+
+from support import load_scraper_module, make_handler, start_server, quiet
+
+fb = load_scraper_module()
+BODY = bytes(range(256)) * 40000
+
+def interrupted_download(handler, url, file_path):
+    # The first attempt is cut off after drop_after bytes and no retries are allowed, leaving a .part file
+    handler.drop_after = 3000000
+    scraper = fb.FacebookAlbumScraper(download_retries=0, log_callback=quiet)
+    assert not scraper.download_media_from_url(url, file_path, 'video')
+    handler.drop_after = 0
+    return scraper
+
+def check_range_resume(folder):
+    handler = make_handler(body=BODY)
+    server, base = start_server(handler)
+    file_path = os.path.join(folder, "resume.mp4")
+    scraper = interrupted_download(handler, base + "resume.mp4", file_path)
+    assert os.path.exists(file_path + ".part.json")
+    offset = os.path.getsize(file_path + ".part")
+    assert scraper.download_media_from_url(base + "resume.mp4", file_path, 'video')
+    assert handler.requests_seen[-1][1] == f"bytes={offset}-"
+    assert open(file_path, 'rb').read() == BODY
+    assert not os.path.exists(file_path + ".part.json")
+    server.shutdown()
+
+def check_changed_file(folder):
+    handler = make_handler(body=BODY)
+    server, base = start_server(handler)
+    file_path = os.path.join(folder, "changed.mp4")
+    scraper = interrupted_download(handler, base + "changed.mp4", file_path)
+    # A new ETag fails If-Range, so the server answers 200 with the whole file
+    handler.etag = '"v2"'
+    assert scraper.download_media_from_url(base + "changed.mp4", file_path, 'video')
+    assert open(file_path, 'rb').read() == BODY
+    server.shutdown()
+
+def check_refused_range(folder, status):
+    handler = make_handler(body=BODY)
+    server, base = start_server(handler)
+    file_path = os.path.join(folder, f"refused_{status}.mp4")
+    scraper = interrupted_download(handler, base + "refused.mp4", file_path)
+    handler.range_status = status
+    assert scraper.download_media_from_url(base + "refused.mp4", file_path, 'video')
+    ranges = [requested_range for _, requested_range in handler.requests_seen]
+    assert ranges[0] is None and ranges[1] and ranges[2] is None, ranges
+    assert open(file_path, 'rb').read() == BODY
+    server.shutdown()
+
+def check_encoded_body(folder):
+    handler = make_handler(body=BODY, encode=True)
+    server, base = start_server(handler)
+    file_path = os.path.join(folder, "encoded.jpg")
+    scraper = fb.FacebookAlbumScraper(download_retries=0, log_callback=quiet)
+    assert scraper.download_media_from_url(base + "encoded.jpg", file_path, 'image')
+    assert open(file_path, 'rb').read() == BODY
+    # Decoded bytes cannot be resumed with byte ranges, so no range metadata may be left behind
+    handler.drop_after = 20000
+    assert not scraper.download_media_from_url(base + "encoded.jpg", file_path + "2", 'image')
+    assert not os.path.exists(file_path + "2.part.json")
+    server.shutdown()
+
+def main():
+    with tempfile.TemporaryDirectory() as folder:
+        checks = [
+            ("range resume", lambda: check_range_resume(folder)),
+            ("changed file restarts", lambda: check_changed_file(folder)),
+            ("416 restarts without Range", lambda: check_refused_range(folder, 416)),
+            ("500 restarts without Range", lambda: check_refused_range(folder, 500)),
+            ("encoded body keeps no range metadata", lambda: check_encoded_body(folder)),
+        ]
+        for name, check in checks:
+            check()
+            print(f"ok  {name}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+Replays a recorded Chrome performance log through NetworkMediaLog without a browser.
+Record one by passing network_log_file=... to a FacebookAlbumScraper in network capture mode, then:
+
+    python tools/replay_network_log.py path/to/network_log.jsonl [--image SRC ...]
+
+Without a log file a small synthetic one is built and the expected picks are checked.
+"""
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+
+from support import load_scraper_module
+
+fb = load_scraper_module()
+
+def response_entry(url, mime_type, size, request_id):
+    message = {"message": {"method": "Network.responseReceived",
+                           "params": {"requestId": request_id,
+                                      "response": {"url": url, "mimeType": mime_type,
+                                                   "headers": {"Content-Length": str(size)}}}}}
+    return {"message": json.dumps(message), "webview": "sample"}
+
+def summarize(network_log, image_sources):
+    counts = {}
+    for response in network_log.responses:
+        counts[response["media_type"]] = counts.get(response["media_type"], 0) + 1
+    print(f"media responses: {counts}")
+    for src in image_sources:
+        print(f"best variant of {src}: {network_log.best_image_variant(src)}")
+    network_log.navigation_mark = 0
+    print(f"largest video: {network_log.current_video()}")
+
+def check_sample():
+    small = "https://scontent.xx.fbcdn.net/v/t39/111_n.jpg?stp=dst-jpg_s480x480"
+    large = "https://scontent.xx.fbcdn.net/v/t39/111_n.jpg?stp=dst-jpg_s2048x2048"
+    segment = "https://video.xx.fbcdn.net/v/t42/333_n.mp4?efg=1&bytestart=0&byteend=9999"
+    with tempfile.TemporaryDirectory() as folder:
+        log_path = os.path.join(folder, "network_log.jsonl")
+        recorder = fb.NetworkMediaLog(log_path)
+        recorder.feed([
+            response_entry(small, "image/jpeg", 20000, "1"),
+            response_entry(large, "image/jpeg", 400000, "2"),
+            response_entry("https://static.xx.fbcdn.net/rsrc.php/x.js", "application/javascript", 1, "3"),
+            {"message": "{not json"},
+        ])
+        recorder.mark_navigation()
+        recorder.feed([
+            response_entry("https://video.xx.fbcdn.net/v/t42/222_n.mp4?efg=1&bytestart=0&byteend=1000", "video/mp4", 1000, "4"),
+            response_entry(segment, "video/mp4", 9000, "5"),
+        ])
+        replayed = fb.NetworkMediaLog.replay(log_path)
+        summarize(replayed, [small])
+        assert replayed.best_image_variant(small.replace("s480x480", "s960x960")) == large
+        replayed.navigation_mark = 2
+        assert replayed.current_video() == "https://video.xx.fbcdn.net/v/t42/333_n.mp4?efg=1"
+        assert replayed.find_response(large)["request_id"] == "2"
+    print("ok  sample log replays to the expected picks")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded performance log through NetworkMediaLog")
+    parser.add_argument('log_path', nargs='?', help="JSONL file written through network_log_file")
+    parser.add_argument('--image', action='append', default=[], help="Viewer image src to look up the largest variant for")
+    args = parser.parse_args(argv)
+    if not args.log_path:
+        check_sample()
+        return 0
+    summarize(fb.NetworkMediaLog.replay(args.log_path), args.image)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
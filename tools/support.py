@@ -0,0 +1,106 @@
+"""
+Shared helpers for the benchmark and check scripts in this folder.
+They load the scraper straight from "FB-Album V.1.0.py" (or from an older git revision of it)
+and stand in for Facebook with fake WebDriver objects and a local HTTP server.
+"""
+
+import os
+import re
+import socket
+import subprocess
+import threading
+import gzip
+import importlib.util
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT_NAME = "FB-Album V.1.0.py"
+
+def load_scraper_module(revision=None, name="fb_album"):
+    # Without a revision the working tree is loaded; a revision such as "HEAD~5" is read through git show
+    if revision is None:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(REPO_ROOT, SCRIPT_NAME))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    else:
+        source = subprocess.check_output(['git', '-C', REPO_ROOT, 'show', f"{revision}:{SCRIPT_NAME}"]).decode('utf-8')
+        spec = importlib.util.spec_from_loader(name, loader=None)
+        module = importlib.util.module_from_spec(spec)
+        exec(compile(source, f"{revision}:{SCRIPT_NAME}", 'exec'), module.__dict__)
+    # Newer revisions import Selenium lazily; the fake drivers still need By and Keys
+    if hasattr(module, 'load_selenium'):
+        module.load_selenium()
+    return module
+
+def quiet(message, level):
+    pass
+
+def no_delays(scraper):
+    for delays in scraper.delay_map.values():
+        for key in delays:
+            delays[key] = 0
+    return scraper
+
+class MediaHandler(BaseHTTPRequestHandler):
+    # Class attributes are the knobs; set them on a subclass returned by make_handler
+    protocol_version = 'HTTP/1.1'
+    body = b'x' * 200000
+    delay = 0
+    ranges = True
+    etag = '"v1"'
+    drop_after = 0
+    range_status = None
+    encode = False
+    connections = 0
+    requests_seen = None
+
+    def setup(self):
+        type(self).connections += 1
+        super().setup()
+
+    def do_GET(self):
+        if self.delay:
+            threading.Event().wait(self.delay)
+        requested_range = self.headers.get('Range')
+        self.requests_seen.append((self.path, requested_range))
+        if requested_range and self.range_status:
+            self.send_response(self.range_status)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        start = 0
+        data = self.body
+        if self.encode:
+            data = gzip.compress(self.body)
+            self.send_response(200)
+            self.send_header('Content-Encoding', 'gzip')
+        elif requested_range and self.ranges and self.headers.get('If-Range') in (None, self.etag):
+            start = int(re.match(r'bytes=(\d+)-', requested_range).group(1))
+            self.send_response(206)
+            self.send_header('Content-Range', f"bytes {start}-{len(data) - 1}/{len(data)}")
+        else:
+            self.send_response(200)
+        if self.ranges:
+            self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('ETag', self.etag)
+        self.send_header('Content-Length', str(len(data) - start))
+        self.end_headers()
+        payload = data[start:start + self.drop_after] if self.drop_after else data[start:]
+        self.wfile.write(payload)
+        self.wfile.flush()
+        if self.drop_after and start + self.drop_after < len(data):
+            # Cut the connection mid-body, like a flaky mobile link
+            self.close_connection = True
+            self.connection.shutdown(socket.SHUT_RDWR)
+
+    def log_message(self, *args):
+        pass
+
+def make_handler(**settings):
+    settings.setdefault('requests_seen', [])
+    return type('MediaHandler', (MediaHandler,), settings)
+
+def start_server(handler):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/"